@@ -1,61 +1,98 @@
+import time
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core import security
-from app.db.session import SessionLocal
+from app.core import auth_cache, security
+from app.db.session import AsyncSessionLocal, get_db
 from app.services.auth_service import AuthService
-from app.schemas.user_schema import Token, UserCreate, UserLogin, UserOut
+from app.services.revocation import revocations
+from app.schemas.user_schema import LogoutRequest, RefreshRequest, Token, UserCreate, UserLogin, UserOut
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
-
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
 
 
 @router.post("/register", response_model=UserOut, status_code=status.HTTP_201_CREATED)
-def register(user_in: UserCreate, db: Session = Depends(get_db)):
+async def register(user_in: UserCreate, db: AsyncSession = Depends(get_db)):
     service = AuthService(db)
-    return service.register_user(user_in)
+    return await service.register_user(user_in)
 
 
 @router.post("/login", response_model=Token)
-def login(user_in: UserLogin, db: Session = Depends(get_db)):
+async def login(user_in: UserLogin, db: AsyncSession = Depends(get_db)):
     service = AuthService(db)
-    user = service.authenticate_user(user_in.email, user_in.password)
+    user = await service.authenticate_user(user_in.email, user_in.password)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
-    return service.create_token(user)
+    return await service.create_token(user)
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh(body: RefreshRequest, db: AsyncSession = Depends(get_db)):
+    token = await AuthService(db).refresh_token(body.refresh_token)
+    if not token:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+    return token
 
 
 @router.post("/logout")
-def logout():
+async def logout(
+    body: Optional[LogoutRequest] = None,
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    db: AsyncSession = Depends(get_db),
+):
+    """Revoke the session named by the access token's `sid` or by the refresh token."""
+    service = AuthService(db)
+    claims = security.decode_access_claims(token) if token else None
+    session_id = claims.get("sid") if claims else None
+    if not session_id and body and body.refresh_token:
+        session_id = await service.session_for_refresh_token(body.refresh_token)
+    if session_id:
+        await service.revoke_session(session_id)
     return {"detail": "Logged out"}
 
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> UserOut:
-    user_id = security.decode_access_token(token)
-    if not user_id:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
-    try:
-        user_id_int = int(user_id)
-    except ValueError:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
-    service = AuthService(db)
-    user = service.get_user_by_id(user_id_int)
+def _not_authenticated() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+
+
+async def get_token_user_id(token: str = Depends(oauth2_scheme)) -> int:
+    cached = auth_cache.token_claims.get(token)
+    if cached is None:
+        payload = security.decode_access_claims(token)
+        if not payload:
+            raise _not_authenticated()
+        try:
+            cached = int(payload.get("sub")), payload.get("sid")
+        except (TypeError, ValueError):
+            raise _not_authenticated()
+        expires_at = payload.get("exp")
+        auth_cache.token_claims.set(token, cached, None if expires_at is None else expires_at - time.time())
+    user_id, session_id = cached
+    # In-memory bloom check; only a (possible) hit costs a query.
+    if session_id and await revocations.is_revoked(session_id):
+        raise _not_authenticated()
+    return user_id
+
+
+async def get_current_user(user_id: int = Depends(get_token_user_id)) -> UserOut:
+    # Served from memory for AUTH_CACHE_TTL_SECONDS; the session is only opened on a miss.
+    user = auth_cache.get_user(user_id)
+    if user:
+        return user
+    generation = auth_cache.user_generation(user_id)
+    async with AsyncSessionLocal() as db:
+        user = await AuthService(db).get_user_by_id(user_id)
     if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+        raise _not_authenticated()
+    auth_cache.set_user(user, generation)
     return user
 
 
 @router.get("/me", response_model=UserOut)
-def me(current_user: UserOut = Depends(get_current_user)):
+async def me(current_user: UserOut = Depends(get_current_user)):
     return current_user
@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Response
+
+from app.core.config import settings
+from app.core.keys import get_key_ring, uses_shared_secret
+
+router = APIRouter(prefix="/.well-known", tags=["auth"])
+
+
+@router.get("/jwks.json")
+async def jwks(response: Response):
+    response.headers["Cache-Control"] = f"public, max-age={settings.jwks_max_age_seconds}"
+    if uses_shared_secret():
+        return {"keys": []}
+    return get_key_ring().jwks()
@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from app.core.config import settings
+from app.schemas.user_schema import UserOut
+
+
+class TTLCache:
+    """Thread-safe LRU map whose entries also expire after `ttl` seconds."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# token -> (user_id, session_id), so a repeat token skips signature verification; never outlives `exp`.
+token_claims = TTLCache(settings.auth_cache_max_entries, settings.auth_cache_ttl_seconds)
+# user_id -> (generation, UserOut)
+users = TTLCache(settings.auth_cache_max_entries, settings.auth_cache_ttl_seconds)
+
+_generations: dict[int, int] = {}
+_generations_lock = threading.Lock()
+
+
+def user_generation(user_id: int) -> int:
+    return _generations.get(user_id, 0)
+
+
+def get_user(user_id: int) -> Optional[UserOut]:
+    entry = users.get(user_id)
+    if entry is None:
+        return None
+    generation, user = entry
+    if generation != user_generation(user_id):
+        users.delete(user_id)
+        return None
+    return user
+
+
+def set_user(user: UserOut, generation: int) -> None:
+    # `generation` is read before the DB lookup, so a row loaded while the user
+    # was being changed is never cached as current.
+    users.set(user.id, (generation, user))
+
+
+def invalidate_user(user_id: int) -> None:
+    """Call after any change to a user's credentials, role or active flag."""
+    with _generations_lock:
+        _generations[user_id] = _generations.get(user_id, 0) + 1
+    users.delete(user_id)
@@ -0,0 +1,100 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from app.core import security
+from app.core.config import settings
+
+
+class PasswordHasherBusy(Exception):
+    """Raised instead of queueing when the hashing pool is saturated."""
+
+
+class PasswordHasher:
+    """Runs bcrypt in a bounded process pool so it never burns request-thread CPU.
+
+    At most `workers + queue_depth` operations are in flight; anything beyond that
+    is rejected immediately with `PasswordHasherBusy` (served as 503).
+    """
+
+    def __init__(self, workers: int | None = None, queue_depth: int | None = None):
+        self.workers = workers or settings.password_hash_workers or os.cpu_count() or 1
+        self.limit = self.workers + (
+            settings.password_hash_queue_depth if queue_depth is None else queue_depth
+        )
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        # spawn: forking a threaded server process is unsafe.
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _submit(self, fn, *args) -> Future:
+        with self._lock:
+            if self._in_flight >= self.limit:
+                raise PasswordHasherBusy()
+            self._in_flight += 1
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def hash(self, password: str) -> str:
+        return self._submit(security.hash_password, password).result(settings.password_hash_timeout_seconds)
+
+    def verify_and_update(self, password: str, hashed_password: str) -> tuple[bool, str | None]:
+        """Check `password`; the second item is a fresh hash when the stored one is outdated."""
+        future = self._submit(security.verify_and_update_password, password, hashed_password)
+        return future.result(settings.password_hash_timeout_seconds)
+
+    async def ahash(self, password: str) -> str:
+        future = self._submit(security.hash_password, password)
+        return await asyncio.wait_for(asyncio.wrap_future(future), settings.password_hash_timeout_seconds)
+
+    async def averify_and_update(self, password: str, hashed_password: str) -> tuple[bool, str | None]:
+        future = self._submit(security.verify_and_update_password, password, hashed_password)
+        return await asyncio.wait_for(asyncio.wrap_future(future), settings.password_hash_timeout_seconds)
+
+    def warm_up(self) -> None:
+        """Start every worker process now instead of on the first logins."""
+        futures = [self._executor.submit(os.getpid) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+_hasher: PasswordHasher | None = None
+
+
+def init_password_hasher() -> PasswordHasher:
+    global _hasher
+    if _hasher is None:
+        _hasher = PasswordHasher()
+        _hasher.warm_up()
+    return _hasher
+
+
+def get_password_hasher() -> PasswordHasher:
+    return init_password_hasher()
+
+
+def close_password_hasher() -> None:
+    global _hasher
+    if _hasher is not None:
+        _hasher.shutdown()
+        _hasher = None
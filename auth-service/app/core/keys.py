@@ -0,0 +1,109 @@
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from jose import jwk
+
+from app.core.config import settings
+
+ALGORITHMS = ("RS256", "ES256")
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    kid: str
+    algorithm: str
+    private_pem: bytes
+    public_jwk: dict
+
+
+def _algorithm_for(private_key) -> str:
+    if isinstance(private_key, rsa.RSAPrivateKey):
+        return "RS256"
+    if isinstance(private_key, ec.EllipticCurvePrivateKey) and isinstance(private_key.curve, ec.SECP256R1):
+        return "ES256"
+    raise ValueError(f"Unsupported signing key type: {type(private_key).__name__}")
+
+
+def load_signing_key(path: Path) -> SigningKey:
+    private_pem = path.read_bytes()
+    algorithm = _algorithm_for(serialization.load_pem_private_key(private_pem, password=None))
+    public_jwk = jwk.construct(private_pem, algorithm).public_key().to_dict()
+    kid = path.stem
+    return SigningKey(kid, algorithm, private_pem, {**public_jwk, "kid": kid, "use": "sig"})
+
+
+def generate_signing_key(keys_dir: str, algorithm: Optional[str] = None) -> Path:
+    """Write a new private key named by its creation time, so kids sort oldest to newest."""
+    algorithm = algorithm or settings.algorithm
+    if algorithm == "RS256":
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    elif algorithm == "ES256":
+        private_key = ec.generate_private_key(ec.SECP256R1())
+    else:
+        raise ValueError(f"Cannot generate a key for {algorithm}; expected one of {ALGORITHMS}")
+    directory = Path(keys_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}.pem"
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as handle:
+        handle.write(pem)
+    return path
+
+
+def uses_shared_secret() -> bool:
+    return settings.algorithm.startswith("HS")
+
+
+class KeyRing:
+    """Every key in JWT_KEYS_DIR verifies and is published; one of them signs.
+
+    The signer is JWT_ACTIVE_KID, or the newest key. Rotation: add a key, let
+    verifiers pick it up from the JWKS, then make it active. Remove the old
+    key once the tokens it signed have expired.
+    """
+
+    def __init__(self, keys: list[SigningKey], active_kid: Optional[str] = None):
+        if not keys:
+            raise ValueError("No signing keys found")
+        self.keys = {key.kid: key for key in keys}
+        active_kid = active_kid or max(self.keys)
+        if active_kid not in self.keys:
+            raise ValueError(f"JWT_ACTIVE_KID {active_kid!r} is not in the key directory")
+        self.active = self.keys[active_kid]
+        self._jwks = {"keys": [key.public_jwk for key in keys]}
+
+    @classmethod
+    def from_directory(cls, keys_dir: str, active_kid: Optional[str] = None) -> "KeyRing":
+        return cls([load_signing_key(path) for path in sorted(Path(keys_dir).glob("*.pem"))], active_kid)
+
+    def public_jwk(self, kid: Optional[str]) -> Optional[dict]:
+        key = self.keys.get(kid) if kid else None
+        return key.public_jwk if key else None
+
+    def jwks(self) -> dict:
+        return self._jwks
+
+
+_key_ring: Optional[KeyRing] = None
+
+
+def init_key_ring() -> KeyRing:
+    global _key_ring
+    if _key_ring is None:
+        keys_dir = settings.jwt_keys_dir
+        if settings.jwt_generate_missing_key and not any(Path(keys_dir).glob("*.pem")):
+            generate_signing_key(keys_dir)
+        _key_ring = KeyRing.from_directory(keys_dir, settings.jwt_active_kid)
+    return _key_ring
+
+
+def get_key_ring() -> KeyRing:
+    return init_key_ring()
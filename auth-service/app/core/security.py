@@ -1,3 +1,6 @@
+import hashlib
+import secrets
+import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
@@ -5,8 +8,15 @@ from jose import jwt, JWTError
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.keys import get_key_ring, uses_shared_secret
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# min_rounds makes needs_update() flag hashes made with a lower cost than configured.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.bcrypt_rounds,
+    bcrypt__min_rounds=settings.bcrypt_rounds,
+)
 
 
 def hash_password(password: str) -> str:
@@ -17,20 +27,57 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def new_refresh_token() -> tuple[str, str]:
+    """Return `(token, sha256 hex)`; only the hash is stored."""
+    token = secrets.token_urlsafe(32)
+    return token, hash_refresh_token(token)
+
+
+def hash_refresh_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
 def create_access_token(
-    subject: str, role: Optional[str] = None, expires_minutes: Optional[int] = None
+    subject: str,
+    role: Optional[str] = None,
+    expires_minutes: Optional[int] = None,
+    session_id: Optional[str] = None,
 ) -> str:
     expire_minutes = expires_minutes or settings.access_token_expires_minutes
-    expire = datetime.now(timezone.utc) + timedelta(minutes=expire_minutes)
-    to_encode = {"sub": subject, "exp": expire}
+    now = datetime.now(timezone.utc)
+    to_encode = {
+        "sub": subject,
+        "iss": settings.jwt_issuer,
+        "iat": now,
+        "exp": now + timedelta(minutes=expire_minutes),
+        "jti": uuid.uuid4().hex,
+    }
     if role:
         to_encode["role"] = role
-    return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
+    if session_id:
+        to_encode["sid"] = session_id
+    if uses_shared_secret():
+        return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
+    key = get_key_ring().active
+    return jwt.encode(to_encode, key.private_pem, algorithm=key.algorithm, headers={"kid": key.kid})
 
 
-def decode_access_token(token: str) -> Optional[str]:
+def decode_access_claims(token: str) -> Optional[dict]:
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
-        return payload.get("sub")
+        if uses_shared_secret():
+            return jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        public_jwk = get_key_ring().public_jwk(jwt.get_unverified_header(token).get("kid"))
+        if public_jwk is None:
+            return None
+        return jwt.decode(token, public_jwk, algorithms=[public_jwk["alg"]], issuer=settings.jwt_issuer)
     except JWTError:
         return None
+
+
+def decode_access_token(token: str) -> Optional[str]:
+    payload = decode_access_claims(token)
+    return payload.get("sub") if payload else None
@@ -0,0 +1,30 @@
+import datetime
+
+from sqlalchemy import Column, DateTime, Integer, String
+
+from app.db.base import Base
+
+
+class RefreshToken(Base):
+    """One row per issued refresh token; the raw token is never stored, only its sha256."""
+
+    __tablename__ = "refresh_tokens"
+
+    token_hash = Column(String(64), primary_key=True)
+    # The login session; every rotation of the same login shares it.
+    session_id = Column(String(32), index=True, nullable=False)
+    user_id = Column(Integer, index=True, nullable=False)
+    expires_at = Column(DateTime, index=True, nullable=False)
+    rotated_at = Column(DateTime, nullable=True)
+    revoked_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+
+
+class RevokedToken(Base):
+    """Revoked session ids, kept until no access token naming them can still be valid."""
+
+    __tablename__ = "revoked_tokens"
+
+    token_id = Column(String(32), primary_key=True)
+    expires_at = Column(DateTime, index=True, nullable=False)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
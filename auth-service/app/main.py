@@ -1,12 +1,14 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from app.api.auth_router import router as auth_router
+from app.api.well_known_router import router as well_known_router
 from app.core.config import settings
-from app.db.base import Base
-from app.db.session import engine
-
-Base.metadata.create_all(bind=engine)
+from app.core.hashing import PasswordHasherBusy, close_password_hasher, init_password_hasher
+from app.core.keys import init_key_ring, uses_shared_secret
+from app.db.session import close_db, init_db
+from app.services.revocation import TokenSweeper, revocations
 
 app = FastAPI(title="Auth Service", version="0.1.0")
 
@@ -19,3 +21,33 @@ app.add_middleware(
 )
 
 app.include_router(auth_router)
+app.include_router(well_known_router)
+
+token_sweeper = TokenSweeper()
+
+
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy(request: Request, exc: PasswordHasherBusy):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Authentication is busy, retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.on_event("startup")
+async def on_startup():
+    await init_db()
+    if not uses_shared_secret():
+        init_key_ring()
+    init_password_hasher()
+    await revocations.start()
+    await token_sweeper.start()
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await token_sweeper.stop()
+    await revocations.stop()
+    close_password_hasher()
+    await close_db()
@@ -0,0 +1,73 @@
+import datetime
+from typing import Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.session_token import RefreshToken, RevokedToken
+
+
+class TokenRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def add_refresh_token(
+        self, token_hash: str, session_id: str, user_id: int, expires_at: datetime.datetime
+    ) -> RefreshToken:
+        token = RefreshToken(
+            token_hash=token_hash, session_id=session_id, user_id=user_id, expires_at=expires_at
+        )
+        self.db.add(token)
+        await self.db.flush()
+        return token
+
+    async def get_refresh_token(self, token_hash: str) -> Optional[RefreshToken]:
+        return await self.db.get(RefreshToken, token_hash)
+
+    async def get_refresh_token_for_update(self, token_hash: str) -> Optional[RefreshToken]:
+        # Locks the row so two concurrent refreshes with the same token cannot both rotate it.
+        result = await self.db.execute(
+            select(RefreshToken).where(RefreshToken.token_hash == token_hash).with_for_update()
+        )
+        return result.scalar_one_or_none()
+
+    async def revoke_session(self, session_id: str, expires_at: datetime.datetime) -> None:
+        now = datetime.datetime.utcnow()
+        await self.db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.session_id == session_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=now)
+        )
+        revoked = insert(RevokedToken).values(token_id=session_id, expires_at=expires_at, created_at=now)
+        await self.db.execute(revoked.on_duplicate_key_update(expires_at=revoked.inserted.expires_at))
+
+    async def is_revoked(self, token_id: str) -> bool:
+        result = await self.db.execute(
+            select(RevokedToken.token_id).where(
+                RevokedToken.token_id == token_id, RevokedToken.expires_at > datetime.datetime.utcnow()
+            )
+        )
+        return result.scalar_one_or_none() is not None
+
+    async def revoked_ids(self) -> list[str]:
+        result = await self.db.execute(
+            select(RevokedToken.token_id).where(RevokedToken.expires_at > datetime.datetime.utcnow())
+        )
+        return list(result.scalars())
+
+    async def purge_expired(self, model, batch_size: int) -> int:
+        """Delete up to `batch_size` expired rows, oldest first, via the expires_at index."""
+        key = model.__mapper__.primary_key[0]
+        expired = (
+            select(key)
+            .where(model.expires_at < datetime.datetime.utcnow())
+            .order_by(model.expires_at)
+            .limit(batch_size)
+        )
+        ids = list((await self.db.execute(expired)).scalars())
+        if not ids:
+            return 0
+        await self.db.execute(delete(model).where(key.in_(ids)))
+        await self.db.commit()
+        return len(ids)
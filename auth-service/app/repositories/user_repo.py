@@ -1,29 +1,36 @@
 from typing import Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import auth_cache
 from app.db.models.user_credential import UserCredential
 from app.schemas.user_schema import UserCreate
-from app.core.security import hash_password
 
 
 class UserRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def get_by_email(self, email: str) -> Optional[UserCredential]:
-        return self.db.query(UserCredential).filter(UserCredential.email == email).first()
+    async def get_by_email(self, email: str) -> Optional[UserCredential]:
+        result = await self.db.execute(select(UserCredential).where(UserCredential.email == email))
+        return result.scalar_one_or_none()
 
-    def get_by_id(self, user_id: int) -> Optional[UserCredential]:
-        return self.db.query(UserCredential).filter(UserCredential.id == user_id).first()
+    async def get_by_id(self, user_id: int) -> Optional[UserCredential]:
+        return await self.db.get(UserCredential, user_id)
 
-    def create(self, user_in: UserCreate) -> UserCredential:
+    async def create(self, user_in: UserCreate, hashed_password: str) -> UserCredential:
         db_user = UserCredential(
             email=user_in.email,
-            hashed_password=hash_password(user_in.password),
+            hashed_password=hashed_password,
             role=user_in.role,
         )
         self.db.add(db_user)
-        self.db.commit()
-        self.db.refresh(db_user)
+        await self.db.commit()
+        await self.db.refresh(db_user)
         return db_user
+
+    async def update_password_hash(self, user: UserCredential, hashed_password: str) -> None:
+        user.hashed_password = hashed_password
+        await self.db.commit()
+        auth_cache.invalidate_user(user.id)
@@ -1,41 +1,103 @@
+import datetime
+import uuid
 from typing import Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
 from app.core import security
+from app.core.config import settings
+from app.core.hashing import PasswordHasher, get_password_hasher
+from app.repositories.token_repo import TokenRepository
 from app.repositories.user_repo import UserRepository
 from app.schemas.user_schema import UserCreate, UserOut, Token
+from app.services.revocation import revocations
 
 
 class AuthService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession, hasher: Optional[PasswordHasher] = None):
+        self.db = db
         self.user_repo = UserRepository(db)
+        self.token_repo = TokenRepository(db)
+        self.hasher = hasher or get_password_hasher()
 
-    def register_user(self, user_in: UserCreate) -> UserOut:
-        existing = self.user_repo.get_by_email(user_in.email)
+    async def register_user(self, user_in: UserCreate) -> UserOut:
+        existing = await self.user_repo.get_by_email(user_in.email)
         if existing:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered",
             )
-        user = self.user_repo.create(user_in)
+        hashed_password = await self.hasher.ahash(user_in.password)
+        user = await self.user_repo.create(user_in, hashed_password)
         return UserOut.model_validate(user)
 
-    def authenticate_user(self, email: str, password: str) -> Optional[UserOut]:
-        user = self.user_repo.get_by_email(email)
+    async def authenticate_user(self, email: str, password: str) -> Optional[UserOut]:
+        user = await self.user_repo.get_by_email(email)
         if not user:
             return None
-        if not security.verify_password(password, user.hashed_password):
+        verified, new_hash = await self.hasher.averify_and_update(password, user.hashed_password)
+        if not verified:
             return None
+        if new_hash:
+            # Stored hash predates the current cost factor (or scheme); upgrade it transparently.
+            await self.user_repo.update_password_hash(user, new_hash)
         return UserOut.model_validate(user)
 
-    def get_user_by_id(self, user_id: int) -> Optional[UserOut]:
-        user = self.user_repo.get_by_id(user_id)
+    async def get_user_by_id(self, user_id: int) -> Optional[UserOut]:
+        user = await self.user_repo.get_by_id(user_id)
         if not user:
             return None
         return UserOut.model_validate(user)
 
-    def create_token(self, user: UserOut) -> Token:
-        access_token = security.create_access_token(subject=str(user.id), role=user.role)
-        return Token(access_token=access_token)
+    async def create_token(self, user: UserOut, session_id: Optional[str] = None) -> Token:
+        """Issue an access token and a fresh refresh token; a new login starts a new session."""
+        session_id = session_id or uuid.uuid4().hex
+        refresh_token, token_hash = security.new_refresh_token()
+        expires_at = datetime.datetime.utcnow() + datetime.timedelta(days=settings.refresh_token_expires_days)
+        await self.token_repo.add_refresh_token(token_hash, session_id, user.id, expires_at)
+        await self.db.commit()
+        access_token = security.create_access_token(
+            subject=str(user.id), role=user.role, session_id=session_id
+        )
+        return Token(
+            access_token=access_token,
+            expires_in=settings.access_token_expires_minutes * 60,
+            refresh_token=refresh_token,
+        )
+
+    async def refresh_token(self, refresh_token: str) -> Optional[Token]:
+        """Rotate `refresh_token`: it is spent and a new pair is issued in the same session.
+
+        Presenting an already-rotated token means it was copied, so the whole
+        session is revoked.
+        """
+        token_hash = security.hash_refresh_token(refresh_token)
+        stored = await self.token_repo.get_refresh_token_for_update(token_hash)
+        now = datetime.datetime.utcnow()
+        if not stored or stored.revoked_at or stored.expires_at <= now:
+            await self.db.rollback()
+            return None
+        if stored.rotated_at:
+            await self.revoke_session(stored.session_id)
+            return None
+        # Re-read the user so a role change since login is in the new access token.
+        user = await self.user_repo.get_by_id(stored.user_id)
+        if not user or not user.is_active:
+            await self.db.rollback()
+            return None
+        stored.rotated_at = now
+        return await self.create_token(UserOut.model_validate(user), stored.session_id)
+
+    async def session_for_refresh_token(self, refresh_token: str) -> Optional[str]:
+        stored = await self.token_repo.get_refresh_token(security.hash_refresh_token(refresh_token))
+        return stored.session_id if stored else None
+
+    async def revoke_session(self, session_id: str) -> None:
+        # No access token of the session outlives this entry.
+        expires_at = datetime.datetime.utcnow() + datetime.timedelta(
+            minutes=settings.access_token_expires_minutes
+        )
+        await self.token_repo.revoke_session(session_id, expires_at)
+        await self.db.commit()
+        revocations.add(session_id)
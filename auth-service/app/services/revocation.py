@@ -0,0 +1,111 @@
+import asyncio
+import logging
+
+from app.core.bloom import BloomFilter
+from app.core.config import settings
+from app.db.models.session_token import RefreshToken, RevokedToken
+from app.db.session import AsyncSessionLocal
+from app.repositories.token_repo import TokenRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def _every(interval: float, stopping: asyncio.Event, action, name: str) -> None:
+    while not stopping.is_set():
+        try:
+            await asyncio.wait_for(stopping.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+        if stopping.is_set():
+            break
+        try:
+            await action()
+        except Exception:
+            logger.exception("%s failed", name)
+
+
+class RevocationList:
+    """Bloom filter of revoked session ids, rebuilt from `revoked_tokens` every REVOCATION_SYNC_SECONDS.
+
+    A miss is definitive, so the common case costs no I/O. A hit may be a
+    false positive and is confirmed against the table. Revocations made in
+    this process are added at once; other replicas see them at their next sync.
+    """
+
+    def __init__(self):
+        self._bloom = BloomFilter(settings.revocation_bloom_capacity, settings.revocation_bloom_error_rate)
+        # One set per sync in flight, collecting local adds the sync's DB read may have missed.
+        self._added_during_sync: list[set[str]] = []
+        self._task: asyncio.Task | None = None
+        self._stopping = asyncio.Event()
+
+    async def start(self):
+        try:
+            await self.sync()
+        except Exception:
+            logger.exception("Revocation list sync failed")
+        self._task = asyncio.create_task(
+            _every(settings.revocation_sync_seconds, self._stopping, self.sync, "Revocation list sync")
+        )
+
+    async def stop(self):
+        self._stopping.set()
+        if self._task:
+            await self._task
+
+    async def sync(self):
+        added: set[str] = set()
+        self._added_during_sync.append(added)
+        try:
+            async with AsyncSessionLocal() as db:
+                revoked = await TokenRepository(db).revoked_ids()
+        finally:
+            self._added_during_sync.remove(added)
+        # No await between here and the swap, so no add() can slip in unseen.
+        self._bloom = BloomFilter.from_items(
+            [*revoked, *added], settings.revocation_bloom_capacity, settings.revocation_bloom_error_rate
+        )
+
+    def add(self, token_id: str) -> None:
+        self._bloom.add(token_id)
+        for added in self._added_during_sync:
+            added.add(token_id)
+
+    async def is_revoked(self, token_id: str) -> bool:
+        if token_id not in self._bloom:
+            return False
+        async with AsyncSessionLocal() as db:
+            return await TokenRepository(db).is_revoked(token_id)
+
+
+class TokenSweeper:
+    """Deletes expired refresh tokens and revocations in TOKEN_SWEEP_BATCH_SIZE chunks."""
+
+    def __init__(self):
+        self._task: asyncio.Task | None = None
+        self._stopping = asyncio.Event()
+
+    async def start(self):
+        self._task = asyncio.create_task(
+            _every(settings.token_sweep_interval_seconds, self._stopping, self.sweep, "Token sweep")
+        )
+
+    async def stop(self):
+        self._stopping.set()
+        if self._task:
+            await self._task
+
+    async def sweep(self) -> int:
+        deleted = 0
+        for model in (RefreshToken, RevokedToken):
+            while not self._stopping.is_set():
+                # One short transaction per batch keeps locks brief on a busy table.
+                async with AsyncSessionLocal() as db:
+                    count = await TokenRepository(db).purge_expired(model, settings.token_sweep_batch_size)
+                deleted += count
+                if count < settings.token_sweep_batch_size:
+                    break
+        return deleted
+
+
+revocations = RevocationList()
@@ -0,0 +1,68 @@
+"""Login hashing throughput versus worker processes.
+
+Run from the auth-service directory:
+
+    BCRYPT_ROUNDS=12 python -m scripts.bench_login --logins 400
+
+For each pool size (1, 2, 4, ... up to the CPU count) it pushes `--logins`
+password verifications through `PasswordHasher` from 64 request threads, and
+reports logins/s and p99 latency. The inline row is the old behaviour:
+bcrypt called directly from the request threads.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core import security
+from app.core.config import settings
+from app.core.hashing import PasswordHasher
+
+PASSWORD = "correct horse battery staple"
+REQUEST_THREADS = 64
+
+
+def measure(verify, stored_hash: str, logins: int) -> tuple[float, float]:
+    latencies: list[float] = []
+
+    def login(_):
+        started = time.perf_counter()
+        verified, _new_hash = verify(PASSWORD, stored_hash)
+        if not verified:
+            raise RuntimeError("verification failed")
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(REQUEST_THREADS) as pool:
+        list(pool.map(login, range(logins)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return logins / elapsed, latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=400)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    stored_hash = security.hash_password(PASSWORD)
+    print(f"bcrypt rounds={settings.bcrypt_rounds}, cpus={os.cpu_count()}")
+
+    rate, p99 = measure(security.verify_and_update_password, stored_hash, args.logins)
+    print(f"inline      {rate:8.1f} logins/s  p99 {p99:8.1f} ms")
+
+    workers = 1
+    while workers <= args.max_workers:
+        hasher = PasswordHasher(workers=workers, queue_depth=args.logins)
+        hasher.warm_up()
+        try:
+            rate, p99 = measure(hasher.verify_and_update, stored_hash, args.logins)
+        finally:
+            hasher.shutdown()
+        print(f"workers={workers:<3} {rate:8.1f} logins/s  p99 {p99:8.1f} ms")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Add a signing key to JWT_KEYS_DIR and optionally retire old ones.
+
+Run from the auth-service directory:
+
+    python -m scripts.rotate_jwt_key --algorithm RS256 --retire-after-days 2
+
+The new key is published in /.well-known/jwks.json after auth-service
+restarts. It signs only once it is the newest key and JWT_ACTIVE_KID is unset,
+or once JWT_ACTIVE_KID names it. To let verifiers fetch it first, pin
+JWT_ACTIVE_KID to the current key until their JWKS refresh interval has
+passed. A retired key must outlive the tokens it signed, so
+`--retire-after-days` should exceed ACCESS_TOKEN_EXPIRES_MINUTES.
+"""
+import argparse
+import time
+from pathlib import Path
+
+from app.core.config import settings
+from app.core.keys import ALGORITHMS, generate_signing_key
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys-dir", default=settings.jwt_keys_dir)
+    parser.add_argument("--algorithm", choices=ALGORITHMS, default=None)
+    parser.add_argument(
+        "--retire-after-days",
+        type=float,
+        help="Delete keys (other than the new one and the one before it) older than this.",
+    )
+    args = parser.parse_args()
+
+    path = generate_signing_key(args.keys_dir, args.algorithm)
+    print(f"added {path.stem} ({path})")
+
+    if args.retire_after_days is not None:
+        keys = sorted(Path(args.keys_dir).glob("*.pem"))
+        cutoff = time.time() - args.retire_after_days * 86400
+        for old in keys[:-2]:
+            if old.stat().st_mtime < cutoff:
+                old.unlink()
+                print(f"retired {old.stem}")
+
+
+if __name__ == "__main__":
+    main()
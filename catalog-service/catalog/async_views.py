@@ -0,0 +1,97 @@
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.http import JsonResponse
+from django.utils.cache import get_conditional_response
+from django.views import View
+
+from .cache import CATEGORY_TREE_KEY, aget, aproduct_list_key, product_detail_key
+from .categories import iter_tree
+from .conditional import content_validators, detail_validators, finalize_response, is_current
+from .models import Product
+from .views import CategoryViewSet, ProductViewSet
+
+
+def _render_sync_view(view, request, **kwargs):
+    try:
+        response = view(request, **kwargs)
+        if hasattr(response, "render"):
+            response.render()
+        return response
+    finally:
+        # Worker threads outlive the request, so close their connections as a request end would.
+        close_old_connections()
+
+
+# Misses run in the default thread pool rather than Django's single thread-sensitive executor.
+_render_in_pool = sync_to_async(_render_sync_view, thread_sensitive=False)
+
+
+class AsyncReadView(View):
+    """Read-only endpoint that answers cache hits on the event loop.
+
+    A miss runs the matching sync DRF view in a worker thread; it fills the
+    same cache entries the sync API uses, so both paths return the same payload
+    and validators.
+    """
+
+    http_method_names = ["get", "head"]
+    resource = ""
+    fallback = None
+
+    async def lookup(self, request, **kwargs):
+        """Return `(data, etag, last_modified)` from the cache, or None on a miss."""
+        return None
+
+    async def get(self, request, **kwargs):
+        hit = await self.lookup(request, **kwargs)
+        if hit is None:
+            return await _render_in_pool(self.fallback, request, **kwargs)
+        data, etag, last_modified = hit
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = JsonResponse(
+                data, safe=False, json_dumps_params={"ensure_ascii": False, "separators": (",", ":")}
+            )
+        return finalize_response(response, self.resource, etag, last_modified)
+
+
+class ProductListView(AsyncReadView):
+    resource = "products"
+    fallback = staticmethod(ProductViewSet.as_view({"get": "list"}))
+
+    async def lookup(self, request, **kwargs):
+        key = await aproduct_list_key(request.build_absolute_uri())
+        data = await aget(key)
+        if data is None:
+            return None
+        return (data, *content_validators(data, data.get("results", [])))
+
+
+class ProductCardsView(ProductListView):
+    fallback = staticmethod(ProductViewSet.as_view({"get": "cards"}))
+
+
+class ProductDetailView(AsyncReadView):
+    resource = "products"
+    fallback = staticmethod(ProductViewSet.as_view({"get": "retrieve"}))
+
+    async def lookup(self, request, pk, **kwargs):
+        data = await aget(product_detail_key(pk))
+        if data is None:
+            return None
+        # Same freshness check as the sync retrieve: a body older than the row is recomputed.
+        live_updated_at = await Product.objects.filter(pk=pk).values_list("updated_at", flat=True).afirst()
+        if live_updated_at is None or not is_current(data, live_updated_at):
+            return None
+        return (data, *detail_validators(self.resource, pk, data["updated_at"]))
+
+
+class CategoryTreeView(AsyncReadView):
+    resource = "categories"
+    fallback = staticmethod(CategoryViewSet.as_view({"get": "tree"}))
+
+    async def lookup(self, request, **kwargs):
+        data = await aget(CATEGORY_TREE_KEY)
+        if data is None:
+            return None
+        return (data, *content_validators(data, iter_tree(data)))
@@ -0,0 +1,363 @@
+import csv
+import json
+import logging
+import unicodedata
+from dataclasses import asdict, dataclass, field
+from itertools import groupby
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, transaction
+
+from .cards import with_detail_prefetches
+from .images import enqueue
+from .models import (
+    Attribute,
+    Category,
+    ImageDerivativeJob,
+    Product,
+    ProductAttribute,
+    ProductImage,
+    ProductVariant,
+)
+from .signals import bulk_writes, refresh_products
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("ndjson", "csv")
+CONTENT_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+CSV_COLUMNS = [
+    "seller_id",
+    "slug",
+    "name",
+    "description",
+    "status",
+    "category",
+    "sku",
+    "price",
+    "variant_status",
+    "attributes",
+    "images",
+]
+PRODUCT_COLUMNS = ("seller_id", "slug", "name", "description", "status", "category")
+LIST_SEPARATOR = "|"
+
+
+def _db_key(value: str) -> str:
+    """Fold `value` the way MySQL's default utf8mb4_0900_ai_ci collation compares it (case and accents)."""
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    created: int = 0
+    updated: int = 0
+    failed: int = 0
+    errors: list[dict] = field(default_factory=list)
+
+    def add_error(self, row: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < settings.CATALOG_IMPORT_MAX_ERRORS:
+            self.errors.append({"row": row, "error": message})
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class CleanRecord:
+    row: int
+    product: Product
+    variants: list[ProductVariant]
+    attributes: dict[str, str]
+    images: list[str] | None
+
+    @property
+    def key(self) -> tuple[int, str]:
+        # Slugs that MySQL treats as equal are one product, so they share a key.
+        return self.product.seller_id, _db_key(self.product.slug)
+
+
+def _split(value: str) -> list[str]:
+    return [part.strip() for part in value.split(LIST_SEPARATOR) if part.strip()]
+
+
+def read_ndjson(stream):
+    """Yield `(row, record, error)`; one product per line with nested variants/attributes/images."""
+    for row, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield row, None, f"Invalid JSON: {exc}"
+            continue
+        if not isinstance(record, dict):
+            yield row, None, "Each line must be a JSON object."
+            continue
+        yield row, record, None
+
+
+def read_csv(stream):
+    """Yield `(row, record, error)`; one line per variant, consecutive lines of a product are merged.
+
+    `attributes` is `name:value|name:value` and `images` is `url|url`; both are
+    read from the first line of the product that fills them in.
+    """
+    reader = csv.DictReader(stream)
+    lines = enumerate(reader, start=2)
+    for _key, group in groupby(lines, key=lambda item: (item[1].get("seller_id"), item[1].get("slug"))):
+        group = list(group)
+        row, first = group[0]
+        record = {column: first.get(column) or "" for column in PRODUCT_COLUMNS}
+        record["variants"] = [
+            {"sku": line["sku"], "price": line.get("price"), "status": line.get("variant_status") or None}
+            for _row, line in group
+            if line.get("sku")
+        ]
+        attributes = next((line["attributes"] for _row, line in group if line.get("attributes")), "")
+        try:
+            record["attributes"] = dict(pair.split(":", 1) for pair in _split(attributes))
+        except ValueError:
+            yield row, None, "attributes: expected name:value pairs separated by '|'."
+            continue
+        images = next((line["images"] for _row, line in group if line.get("images")), "")
+        if images:
+            record["images"] = _split(images)
+        yield row, record, None
+
+
+READERS = {"ndjson": read_ndjson, "csv": read_csv}
+
+
+def _validation_message(exc: ValidationError) -> str:
+    if hasattr(exc, "message_dict"):
+        return "; ".join(f"{name}: {' '.join(messages)}" for name, messages in exc.message_dict.items())
+    return " ".join(exc.messages)
+
+
+def clean_record(row: int, record: dict, categories: dict[str, int]) -> CleanRecord:
+    for name, kind in (("variants", list), ("attributes", dict), ("images", list)):
+        if record.get(name) is not None and not isinstance(record[name], kind):
+            raise ValidationError({name: [f"Must be a JSON {'object' if kind is dict else 'array'}."]})
+    if not all(isinstance(data, dict) for data in record.get("variants") or []):
+        raise ValidationError({"variants": ["Each variant must be a JSON object."]})
+
+    category_slug = record.get("category") or None
+    category_id = None
+    if category_slug:
+        category_id = categories.get(category_slug)
+        if category_id is None:
+            raise ValidationError({"category": [f"Unknown category slug {category_slug!r}."]})
+
+    product = Product(
+        seller_id=record.get("seller_id"),
+        slug=record.get("slug") or "",
+        name=record.get("name") or "",
+        description=record.get("description") or "",
+        status=record.get("status") or Product.Status.DRAFT,
+        category_id=category_id,
+    )
+    product.clean_fields(exclude=["category"])
+
+    variants: dict[str, ProductVariant] = {}
+    for data in record.get("variants") or []:
+        variant = ProductVariant(
+            sku=data.get("sku") or "",
+            price=data.get("price"),
+            status=data.get("status") or ProductVariant.Status.ACTIVE,
+        )
+        variant.clean_fields(exclude=["product"])
+        variants[variant.sku] = variant
+
+    attributes = {str(name).strip(): str(value).strip() for name, value in (record.get("attributes") or {}).items()}
+    if any(not name or len(name) > 100 or len(value) > 255 for name, value in attributes.items()):
+        raise ValidationError({"attributes": ["Names must be 1-100 and values up to 255 characters."]})
+
+    images = record.get("images")
+    if images is not None:
+        for url in images:
+            ProductImage(url=url).clean_fields(exclude=["product"])
+
+    return CleanRecord(row, product, list(variants.values()), attributes, images)
+
+
+def _write_chunk(records: list[CleanRecord]) -> tuple[int, int]:
+    seller_ids = {record.product.seller_id for record in records}
+    slugs = {record.product.slug for record in records}
+    keys = {record.key for record in records}
+
+    def product_ids() -> dict[tuple[int, str], int]:
+        rows = Product.objects.filter(seller_id__in=seller_ids, slug__in=slugs).values_list(
+            "id", "seller_id", "slug"
+        )
+        found = ((pk, (seller_id, _db_key(slug))) for pk, seller_id, slug in rows)
+        return {key: pk for pk, key in found if key in keys}
+
+    with transaction.atomic(), bulk_writes():
+        existing = product_ids()
+        # MySQL resolves the conflict on the (seller_id, slug) unique key.
+        Product.objects.bulk_create(
+            [record.product for record in records],
+            update_conflicts=True,
+            update_fields=["name", "description", "status", "category", "updated_at"],
+        )
+        ids = product_ids()
+
+        variants = []
+        for record in records:
+            for variant in record.variants:
+                variant.product_id = ids[record.key]
+                variants.append(variant)
+        if variants:
+            ProductVariant.objects.bulk_create(
+                variants, update_conflicts=True, update_fields=["price", "status", "updated_at"]
+            )
+
+        names = {name for record in records for name in record.attributes}
+        if names:
+            Attribute.objects.bulk_create([Attribute(name=name) for name in names], ignore_conflicts=True)
+            attribute_ids = {
+                _db_key(name): pk for name, pk in Attribute.objects.filter(name__in=names).values_list("name", "id")
+            }
+            ProductAttribute.objects.bulk_create(
+                [
+                    ProductAttribute(
+                        product_id=ids[record.key], attribute_id=attribute_ids[_db_key(name)], value=value
+                    )
+                    for record in records
+                    for name, value in record.attributes.items()
+                ],
+                update_conflicts=True,
+                update_fields=["value"],
+            )
+
+        with_images = [record for record in records if record.images is not None]
+        if with_images:
+            ProductImage.objects.filter(product_id__in=[ids[record.key] for record in with_images]).delete()
+            ProductImage.objects.bulk_create(
+                [
+                    ProductImage(product_id=ids[record.key], url=url, position=position)
+                    for record in with_images
+                    for position, url in enumerate(record.images)
+                ]
+            )
+            enqueue(
+                ImageDerivativeJob.Target.PRODUCT_IMAGE,
+                ProductImage.objects.filter(product_id__in=[ids[record.key] for record in with_images])
+                .values_list("id", flat=True),
+            )
+
+        touched = list(ids.values())
+        transaction.on_commit(lambda: refresh_products(touched))
+    created = len(keys - existing.keys())
+    return created, len(keys) - created
+
+
+def import_products(stream, file_format: str, chunk_size: int | None = None) -> ImportReport:
+    """Upsert products from a text stream, `chunk_size` products per transaction.
+
+    Invalid rows are reported and skipped. A chunk that fails in the database
+    is rolled back and all of its rows are reported; later chunks still run.
+    """
+    chunk_size = chunk_size or settings.CATALOG_IMPORT_CHUNK_SIZE
+    categories = dict(Category.objects.values_list("slug", "id"))
+    report = ImportReport()
+    chunk: dict[tuple[int, str], CleanRecord] = {}
+
+    def flush() -> None:
+        if not chunk:
+            return
+        records = list(chunk.values())
+        chunk.clear()
+        try:
+            created, updated = _write_chunk(records)
+        except DatabaseError as exc:
+            for record in records:
+                report.add_error(record.row, f"Database error: {exc}")
+            return
+        except Exception as exc:
+            # The chunk's transaction rolled back; report its rows and carry on with the next chunk.
+            logger.exception("Import chunk failed")
+            for record in records:
+                report.add_error(record.row, f"Import failed: {exc!r}")
+            return
+        report.created += created
+        report.updated += updated
+
+    for row, record, error in READERS[file_format](stream):
+        report.rows += 1
+        if error is None:
+            try:
+                clean = clean_record(row, record, categories)
+            except ValidationError as exc:
+                error = _validation_message(exc)
+        if error is not None:
+            report.add_error(row, error)
+            continue
+        # A product repeated within a chunk keeps its last occurrence.
+        chunk[clean.key] = clean
+        if len(chunk) >= chunk_size:
+            flush()
+    flush()
+    return report
+
+
+def export_record(product: Product) -> dict:
+    return {
+        "seller_id": product.seller_id,
+        "slug": product.slug,
+        "name": product.name,
+        "description": product.description,
+        "status": product.status,
+        "category": product.category.slug if product.category else "",
+        "variants": [
+            {"sku": variant.sku, "price": str(variant.price), "status": variant.status}
+            for variant in product.variants.all()
+        ],
+        "attributes": {item.attribute.name: item.value for item in product.attributes.all()},
+        "images": [image.url for image in product.images.all()],
+    }
+
+
+def _csv_rows(record: dict):
+    extra = {
+        "attributes": LIST_SEPARATOR.join(f"{name}:{value}" for name, value in record["attributes"].items()),
+        "images": LIST_SEPARATOR.join(record["images"]),
+    }
+    product = {column: record[column] for column in PRODUCT_COLUMNS}
+    for index, variant in enumerate(record["variants"] or [None]):
+        row = {**product, **(extra if index == 0 else {})}
+        if variant:
+            row.update(sku=variant["sku"], price=variant["price"], variant_status=variant["status"])
+        yield row
+
+
+class _Echo:
+    def write(self, value: str) -> str:
+        return value
+
+
+def export_products(queryset, file_format: str, chunk_size: int | None = None):
+    """Yield export lines, reading `chunk_size` products at a time by primary-key keyset."""
+    chunk_size = chunk_size or settings.CATALOG_EXPORT_CHUNK_SIZE
+    queryset = with_detail_prefetches(queryset.select_related("category")).order_by("pk")
+    writer = csv.DictWriter(_Echo(), fieldnames=CSV_COLUMNS) if file_format == "csv" else None
+    if writer:
+        yield writer.writeheader()
+
+    last_id = 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last_id)[:chunk_size])
+        if not batch:
+            return
+        for product in batch:
+            record = export_record(product)
+            if writer:
+                for row in _csv_rows(record):
+                    yield writer.writerow(row)
+            else:
+                yield json.dumps(record, ensure_ascii=False) + "\n"
+        last_id = batch[-1].pk
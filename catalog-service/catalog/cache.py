@@ -0,0 +1,113 @@
+import hashlib
+import time
+
+import redis.asyncio as aioredis
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.redis import RedisCache, RedisSerializer
+
+PRODUCT_DETAIL_KEY = "product:{product_id}"
+PRODUCT_LIST_GENERATION_KEY = "product-list:generation"
+PRODUCT_LIST_KEY = "product-list:{generation}:{digest}"
+PRODUCT_SEARCH_KEY = "product-search:{generation}:{digest}"
+CATEGORY_TREE_KEY = "category-tree"
+LOCK_SUFFIX = ":lock"
+LOCK_POLL_SECONDS = 0.05
+
+_MISSING = object()
+_async_client: aioredis.Redis | None = None
+_serializer = RedisSerializer()
+
+
+def product_detail_key(product_id) -> str:
+    return PRODUCT_DETAIL_KEY.format(product_id=product_id)
+
+
+def product_list_key(url: str) -> str:
+    # Keyed on the absolute URL: cached pages embed absolute next/previous links.
+    generation = cache.get_or_set(PRODUCT_LIST_GENERATION_KEY, 1, timeout=None)
+    digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    return PRODUCT_LIST_KEY.format(generation=generation, digest=digest)
+
+
+async def aproduct_list_key(url: str) -> str:
+    generation = await aget(PRODUCT_LIST_GENERATION_KEY)
+    if generation is None:
+        return await sync_to_async(product_list_key)(url)
+    digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    return PRODUCT_LIST_KEY.format(generation=generation, digest=digest)
+
+
+def product_search_key(query_string: str) -> str:
+    # Search results share the list generation so product writes invalidate them too.
+    generation = cache.get_or_set(PRODUCT_LIST_GENERATION_KEY, 1, timeout=None)
+    digest = hashlib.sha1(query_string.encode("utf-8")).hexdigest()
+    return PRODUCT_SEARCH_KEY.format(generation=generation, digest=digest)
+
+
+async def aget(key: str, default=None):
+    """Read a cache entry without leaving the event loop.
+
+    Django's `RedisCache.aget` is a thread-pool wrapper around the sync client;
+    this reads the same key and payload format with redis.asyncio instead.
+    """
+    global _async_client
+    backend = caches["default"]
+    if not isinstance(backend, RedisCache):
+        return await backend.aget(key, default)
+    if _async_client is None:
+        _async_client = aioredis.from_url(settings.CATALOG_REDIS_URL)
+    raw = await _async_client.get(backend.make_and_validate_key(key))
+    return default if raw is None else _serializer.loads(raw)
+
+
+def get_or_compute(key: str, compute, timeout: int, is_fresh=None):
+    """Read-through lookup where only one caller recomputes a missing key.
+
+    Callers that lose the lock race wait for the winner's value; if it does not
+    show up within the lock timeout they compute it themselves without caching.
+    A cached value that fails `is_fresh` is treated as missing and overwritten.
+    """
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING and (is_fresh is None or is_fresh(value)):
+        return value
+
+    lock_key = key + LOCK_SUFFIX
+    lock_timeout = settings.CATALOG_CACHE_LOCK_TIMEOUT
+    if cache.add(lock_key, 1, timeout=lock_timeout):
+        try:
+            value = compute()
+            cache.set(key, value, timeout=timeout)
+            return value
+        finally:
+            cache.delete(lock_key)
+
+    deadline = time.monotonic() + lock_timeout
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_SECONDS)
+        value = cache.get(key, _MISSING)
+        if value is not _MISSING and (is_fresh is None or is_fresh(value)):
+            return value
+        if cache.get(lock_key) is None:
+            break
+    return compute()
+
+
+def invalidate_product(product_id) -> None:
+    cache.delete(product_detail_key(product_id))
+    invalidate_product_lists()
+
+
+def invalidate_product_lists() -> None:
+    # Bumping the generation orphans every cached list page at once; old pages expire on their TTL.
+    try:
+        cache.incr(PRODUCT_LIST_GENERATION_KEY)
+    except ValueError:
+        cache.set(PRODUCT_LIST_GENERATION_KEY, 2, timeout=None)
+
+
+def invalidate_category_tree() -> None:
+    cache.delete(CATEGORY_TREE_KEY)
+    # Category filters on product lists expand to subtrees, so those pages are stale too.
+    invalidate_product_lists()
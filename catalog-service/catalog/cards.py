@@ -0,0 +1,46 @@
+from django.db.models import Max, Min, OuterRef, Prefetch, Subquery
+from django.db.models.expressions import RawSQL
+
+from .models import Attribute, Product, ProductAttribute, ProductImage, ProductVariant
+
+
+def _active_variant_price(aggregate):
+    return Subquery(
+        ProductVariant.objects.filter(product=OuterRef("pk"), status=ProductVariant.Status.ACTIVE)
+        .order_by()
+        .values("product")
+        .annotate(value=aggregate("price"))
+        .values("value")[:1]
+    )
+
+
+def with_card_fields(queryset):
+    """Annotate price range, primary image and attribute map so a card page is one query."""
+    product_table = Product._meta.db_table
+    primary_image = ProductImage.objects.filter(product=OuterRef("pk")).order_by("position", "id")
+    attribute_map = RawSQL(
+        f"SELECT JSON_OBJECTAGG(a.name, pa.value) "
+        f"FROM {ProductAttribute._meta.db_table} pa "
+        f"JOIN {Attribute._meta.db_table} a ON a.id = pa.attribute_id "
+        f"WHERE pa.product_id = {product_table}.id",
+        [],
+    )
+    return queryset.annotate(
+        min_price=_active_variant_price(Min),
+        max_price=_active_variant_price(Max),
+        primary_image=Subquery(primary_image.values("url")[:1]),
+        primary_image_derivatives=Subquery(primary_image.values("derivatives")[:1]),
+        attribute_map=attribute_map,
+    )
+
+
+def with_detail_prefetches(queryset):
+    """Variants, images and attributes in one extra query each, whatever the page size."""
+    return queryset.prefetch_related(
+        Prefetch("variants", queryset=ProductVariant.objects.order_by("id")),
+        Prefetch("images", queryset=ProductImage.objects.order_by("position", "id")),
+        Prefetch(
+            "attributes",
+            queryset=ProductAttribute.objects.select_related("attribute").order_by("attribute__name"),
+        ),
+    )
@@ -0,0 +1,34 @@
+from django.db.models import Subquery
+
+from .models import Category
+from .serializers import CategorySerializer
+
+
+def descendants(**lookup):
+    """Categories matching `lookup` plus everything below them, as one lazy queryset."""
+    subtree_root = Category.objects.filter(**lookup).values("path")[:1]
+    return Category.objects.filter(path__startswith=Subquery(subtree_root))
+
+
+def descendant_ids(category_id: int) -> list[int]:
+    """Return `category_id` and every category below it, in one query."""
+    return list(descendants(pk=category_id).values_list("id", flat=True))
+
+
+def build_category_tree() -> list[dict]:
+    """Every category as nested `children` lists, roots first, siblings by name."""
+    categories = list(Category.objects.order_by("depth", "name", "id"))
+    nodes: dict[int, dict] = {}
+    roots: list[dict] = []
+    for category, data in zip(categories, CategorySerializer(categories, many=True).data):
+        node = {**data, "children": []}
+        nodes[category.pk] = node
+        parent = nodes.get(category.parent_id)
+        (parent["children"] if parent else roots).append(node)
+    return roots
+
+
+def iter_tree(nodes: list[dict]):
+    for node in nodes:
+        yield node
+        yield from iter_tree(node["children"])
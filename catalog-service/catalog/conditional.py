@@ -0,0 +1,111 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import Http404
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date
+
+
+def _timestamp(value) -> int | None:
+    if isinstance(value, str):
+        value = parse_datetime(value)
+    return int(value.timestamp()) if value else None
+
+
+def _content_etag(data) -> str:
+    digest = hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+
+def detail_validators(resource: str, pk, updated_at) -> tuple[str, int]:
+    """Strong ETag and Last-Modified for one row, from its `updated_at`."""
+    if isinstance(updated_at, str):
+        updated_at = parse_datetime(updated_at)
+    return f'"{resource}-{pk}-{int(updated_at.timestamp() * 1_000_000)}"', _timestamp(updated_at)
+
+
+def same_version(left, right) -> bool:
+    if isinstance(left, str):
+        left = parse_datetime(left)
+    if isinstance(right, str):
+        right = parse_datetime(right)
+    return left is not None and right is not None and left == right
+
+
+def is_current(cached, live_updated_at) -> bool:
+    """A cached detail body is current unless the row's live `updated_at` is another version."""
+    return live_updated_at is None or same_version(cached.get("updated_at"), live_updated_at)
+
+
+def content_validators(data, rows) -> tuple[str, int | None]:
+    """Content ETag of `data` and the newest `updated_at` among `rows`."""
+    timestamps = [_timestamp(row.get("updated_at")) for row in rows if row.get("updated_at")]
+    return _content_etag(data), max(timestamps) if timestamps else None
+
+
+def finalize_response(response, resource: str, etag: str | None, last_modified: int | None):
+    if response.status_code not in (200, 304):
+        return response
+    if etag:
+        response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    max_age, stale_while_revalidate = settings.CATALOG_CACHE_CONTROL[resource]
+    patch_cache_control(response, public=True, max_age=max_age, stale_while_revalidate=stale_while_revalidate)
+    return response
+
+
+class ConditionalGetMixin:
+    """ETag / Last-Modified validators and Cache-Control for read endpoints.
+
+    Detail reads check `If-None-Match` against a single `updated_at` lookup
+    before the object is loaded or serialized. List reads derive a content
+    ETag and `Last-Modified` (newest `updated_at` on the page) from the page data.
+    """
+
+    cache_control_resource: str = ""
+
+    def _finalize(self, response, etag: str | None, last_modified: int | None):
+        return finalize_response(response, self.cache_control_resource, etag, last_modified)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            updated_at = (
+                self.get_queryset()
+                .filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+                .values_list("updated_at", flat=True)
+                .first()
+            )
+        except (TypeError, ValueError, DjangoValidationError):
+            # A malformed lookup value is a missing row, as in get_object_or_404.
+            raise Http404
+        if updated_at is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        pk = kwargs[lookup_url_kwarg]
+        etag, last_modified = detail_validators(self.cache_control_resource, pk, updated_at)
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return self._finalize(not_modified, etag, last_modified)
+        self.live_updated_at = updated_at
+        response = super().retrieve(request, *args, **kwargs)
+        body_updated_at = response.data.get("updated_at") if isinstance(response.data, dict) else None
+        if body_updated_at:
+            # Label the body with its own version, so a cached payload never carries a newer ETag.
+            etag, last_modified = detail_validators(self.cache_control_resource, pk, body_updated_at)
+        return self._finalize(response, etag, last_modified)
+
+    def content_conditional_response(self, request, response, rows):
+        """Validate `response` by a hash of its data and the newest `updated_at` in `rows`."""
+        etag, last_modified = content_validators(response.data, rows)
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        return self._finalize(not_modified or response, etag, last_modified)
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        results = response.data.get("results", []) if isinstance(response.data, dict) else response.data
+        return self.content_conditional_response(request, response, results)
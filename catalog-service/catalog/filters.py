@@ -0,0 +1,68 @@
+from decimal import Decimal, InvalidOperation
+
+from django.db.models import Exists, OuterRef
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from .categories import descendants
+from .models import ProductAttribute, ProductVariant
+
+
+def _decimal_param(request, name: str) -> Decimal | None:
+    raw = request.query_params.get(name)
+    if raw in (None, ""):
+        return None
+    try:
+        return Decimal(raw)
+    except InvalidOperation:
+        raise ValidationError({name: "Must be a decimal number."})
+
+
+class ProductFilterBackend(BaseFilterBackend):
+    """Query params: category (id or slug, includes subcategories), status,
+    seller_id, slug, min_price / max_price (any active variant in range) and
+    repeated attribute=<name>:<value>."""
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+
+        category = params.get("category")
+        if category:
+            lookup = {"pk": category} if category.isdigit() else {"slug": category}
+            queryset = queryset.filter(category_id__in=descendants(**lookup).values("id"))
+
+        for field in ("status", "slug"):
+            if params.get(field):
+                queryset = queryset.filter(**{field: params[field]})
+
+        seller_id = params.get("seller_id")
+        if seller_id:
+            if not seller_id.isdigit():
+                raise ValidationError({"seller_id": "Must be an integer."})
+            queryset = queryset.filter(seller_id=int(seller_id))
+
+        min_price = _decimal_param(request, "min_price")
+        max_price = _decimal_param(request, "max_price")
+        if min_price is not None or max_price is not None:
+            variants = ProductVariant.objects.filter(
+                product=OuterRef("pk"), status=ProductVariant.Status.ACTIVE
+            )
+            if min_price is not None:
+                variants = variants.filter(price__gte=min_price)
+            if max_price is not None:
+                variants = variants.filter(price__lte=max_price)
+            queryset = queryset.filter(Exists(variants))
+
+        for raw in params.getlist("attribute"):
+            name, sep, value = raw.partition(":")
+            if not sep or not name:
+                raise ValidationError({"attribute": "Use attribute=<name>:<value>."})
+            queryset = queryset.filter(
+                Exists(
+                    ProductAttribute.objects.filter(
+                        product=OuterRef("pk"), attribute__name=name, value=value
+                    )
+                )
+            )
+
+        return queryset
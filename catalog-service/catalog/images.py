@@ -0,0 +1,213 @@
+import hashlib
+import http.client
+import io
+import ipaddress
+import logging
+import socket
+import urllib.request
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from .cache import invalidate_category_tree
+from .models import Category, ImageDerivativeJob, Product, ProductImage
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVE_DIR = "derivatives"
+EXTENSIONS = {"webp": "webp", "jpeg": "jpg"}
+PIL_FORMATS = {"webp": "WEBP", "jpeg": "JPEG"}
+
+
+def needs_derivatives(instance) -> bool:
+    if isinstance(instance, Category):
+        return bool(instance.image) and instance.image_derivatives.get("source") != instance.image.name
+    return instance.derivatives.get("source") != instance.url
+
+
+def enqueue(target: str, object_ids) -> None:
+    ImageDerivativeJob.objects.bulk_create(
+        [ImageDerivativeJob(target=target, object_id=object_id) for object_id in object_ids],
+        batch_size=1000,
+    )
+
+
+def _encode(image: Image.Image, fmt: str) -> bytes:
+    buffer = io.BytesIO()
+    if fmt == "jpeg":
+        if image.mode in ("RGBA", "LA", "P"):
+            image = image.convert("RGBA")
+            background = Image.new("RGB", image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel("A"))
+            image = background
+        elif image.mode != "RGB":
+            image = image.convert("RGB")
+        image.save(buffer, "JPEG", quality=settings.CATALOG_IMAGE_QUALITY, optimize=True, progressive=True)
+    else:
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA")
+        image.save(buffer, PIL_FORMATS[fmt], quality=settings.CATALOG_IMAGE_QUALITY, method=6)
+    return buffer.getvalue()
+
+
+def render_derivatives(source: bytes) -> dict[str, dict[str, bytes]]:
+    """Resize `source` to each configured width (capped at its own) in each configured format."""
+    with Image.open(io.BytesIO(source)) as opened:
+        image = ImageOps.exif_transpose(opened)
+        image.load()
+    widths = sorted({min(width, image.width) for width in settings.CATALOG_IMAGE_WIDTHS})
+    rendered: dict[str, dict[str, bytes]] = {fmt: {} for fmt in settings.CATALOG_IMAGE_FORMATS}
+    for width in widths:
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.Resampling.LANCZOS)
+        for fmt in rendered:
+            rendered[fmt][str(width)] = _encode(resized, fmt)
+    return rendered
+
+
+def store_derivatives(source: bytes) -> dict[str, dict[str, str]]:
+    """Save rendered files under content-hashed names and return their storage names."""
+    stored: dict[str, dict[str, str]] = {}
+    for fmt, by_width in render_derivatives(source).items():
+        stored[fmt] = {}
+        for width, data in by_width.items():
+            digest = hashlib.sha256(data).hexdigest()[:24]
+            name = f"{DERIVATIVE_DIR}/{digest[:2]}/{digest}-{width}w.{EXTENSIONS[fmt]}"
+            # Same bytes, same name: identical files are written once and never change.
+            if not default_storage.exists(name):
+                default_storage.save(name, ContentFile(data))
+            stored[fmt][width] = name
+    return stored
+
+
+def _connect_public(address, timeout=socket._GLOBAL_DEFAULT_TIMEOUT, source_address=None):
+    host, port = address
+    addresses = {info[4][0] for info in socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)}
+    for ip in addresses:
+        if not ipaddress.ip_address(ip).is_global:
+            raise ValueError(f"Image host {host!r} resolves to non-public address {ip}")
+    # Connect to the address just checked, so a second DNS answer cannot swap in an internal one.
+    return socket.create_connection((sorted(addresses)[0], port), timeout, source_address)
+
+
+class _PublicHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._create_connection = _connect_public
+
+
+class _PublicHTTPSConnection(http.client.HTTPSConnection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._create_connection = _connect_public
+
+
+class _PublicHTTPHandler(urllib.request.HTTPHandler):
+    def http_open(self, req):
+        return self.do_open(_PublicHTTPConnection, req)
+
+
+class _PublicHTTPSHandler(urllib.request.HTTPSHandler):
+    def https_open(self, req):
+        return self.do_open(_PublicHTTPSConnection, req, context=self._context)
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+# No proxies (they would bypass the address check) and no redirects (they could point anywhere).
+_opener = urllib.request.build_opener(
+    urllib.request.ProxyHandler({}), _PublicHTTPHandler, _PublicHTTPSHandler, _NoRedirect
+)
+
+
+def _read_url(url: str) -> bytes:
+    parts = urlsplit(url)
+    if parts.path.startswith(settings.MEDIA_URL):
+        name = parts.path[len(settings.MEDIA_URL):]
+        if default_storage.exists(name):
+            with default_storage.open(name, "rb") as handle:
+                return handle.read()
+    if parts.scheme not in ("http", "https"):
+        raise ValueError(f"Unsupported image URL scheme: {parts.scheme!r}")
+    # Image URLs are user input: only listed hosts are fetched, and none when the list is empty.
+    if parts.hostname not in settings.CATALOG_IMAGE_FETCH_HOSTS:
+        raise ValueError(f"Image host {parts.hostname!r} is not in CATALOG_IMAGE_FETCH_HOSTS")
+    request = urllib.request.Request(url, headers={"User-Agent": "catalog-image-worker"})
+    with _opener.open(request, timeout=settings.CATALOG_IMAGE_FETCH_TIMEOUT) as response:
+        data = response.read(settings.CATALOG_IMAGE_MAX_BYTES + 1)
+    if len(data) > settings.CATALOG_IMAGE_MAX_BYTES:
+        raise ValueError("Image is larger than CATALOG_IMAGE_MAX_BYTES")
+    return data
+
+
+def _process_category(category_id: int) -> None:
+    category = Category.objects.filter(pk=category_id).first()
+    if category is None or not category.image:
+        return
+    source_name = category.image.name
+    with category.image.open("rb") as handle:
+        derivatives = store_derivatives(handle.read())
+    # A newer upload may have landed meanwhile; its own job will fill it in.
+    Category.objects.filter(pk=category_id, image=source_name).update(
+        image_derivatives={"source": source_name, **derivatives}, updated_at=timezone.now()
+    )
+    transaction.on_commit(invalidate_category_tree)
+
+
+def _process_product_image(image_id: int) -> None:
+    from .signals import refresh_products  # signals imports this module
+
+    image = ProductImage.objects.filter(pk=image_id).first()
+    if image is None:
+        return
+    derivatives = store_derivatives(_read_url(image.url))
+    updated = ProductImage.objects.filter(pk=image_id, url=image.url).update(
+        derivatives={"source": image.url, **derivatives}
+    )
+    if updated:
+        Product.objects.filter(pk=image.product_id).update(updated_at=timezone.now())
+        transaction.on_commit(lambda: refresh_products([image.product_id]))
+
+
+PROCESSORS = {
+    ImageDerivativeJob.Target.CATEGORY: _process_category,
+    ImageDerivativeJob.Target.PRODUCT_IMAGE: _process_product_image,
+}
+
+
+def process_next_job() -> bool:
+    """Claim and run one due job; returns False when nothing is due."""
+    with transaction.atomic():
+        job = (
+            ImageDerivativeJob.objects.select_for_update(skip_locked=True)
+            .filter(status=ImageDerivativeJob.Status.PENDING, available_at__lte=timezone.now())
+            .order_by("available_at", "id")
+            .first()
+        )
+        if job is None:
+            return False
+        job.attempts += 1
+        try:
+            with transaction.atomic():
+                PROCESSORS[job.target](job.object_id)
+        except Exception as exc:
+            logger.warning("Image job %s failed (attempt %d): %s", job, job.attempts, exc)
+            job.last_error = str(exc)[:2000]
+            if job.attempts >= settings.CATALOG_IMAGE_MAX_ATTEMPTS:
+                job.status = ImageDerivativeJob.Status.FAILED
+            else:
+                job.available_at = timezone.now() + timedelta(seconds=30 * 2 ** (job.attempts - 1))
+        else:
+            job.status = ImageDerivativeJob.Status.DONE
+            job.last_error = ""
+        job.save(update_fields=["status", "attempts", "available_at", "last_error", "updated_at"])
+    return True
@@ -0,0 +1,27 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from catalog.bulk import FORMATS, export_products
+from catalog.models import Product
+
+
+class Command(BaseCommand):
+    help = "Stream products in the import format (CSV or NDJSON)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=FORMATS, default="ndjson")
+        parser.add_argument("--seller-id", type=int)
+        parser.add_argument("--output", "-o", default="-", help="File to write, or - for stdout.")
+
+    def handle(self, *args, **options):
+        queryset = Product.objects.all()
+        if options["seller_id"] is not None:
+            queryset = queryset.filter(seller_id=options["seller_id"])
+
+        lines = export_products(queryset, options["format"])
+        if options["output"] == "-":
+            sys.stdout.writelines(lines)
+            return
+        with open(options["output"], "w", encoding="utf-8", newline="") as stream:
+            stream.writelines(lines)
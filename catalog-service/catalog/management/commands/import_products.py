@@ -0,0 +1,32 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from catalog.bulk import FORMATS, import_products
+
+
+class Command(BaseCommand):
+    help = "Upsert products, variants, attributes and images from a CSV or NDJSON file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import, or - for stdin.")
+        parser.add_argument("--format", choices=FORMATS, help="Defaults to the file extension.")
+        parser.add_argument("--chunk-size", type=int, help="Products per transaction.")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["format"] or path.rsplit(".", 1)[-1].lower()
+        if file_format not in FORMATS:
+            raise CommandError(f"Cannot tell the format of {path!r}; pass --format.")
+
+        if path == "-":
+            report = import_products(sys.stdin, file_format, options["chunk_size"])
+        else:
+            with open(path, encoding="utf-8-sig", newline="") as stream:
+                report = import_products(stream, file_format, options["chunk_size"])
+
+        for error in report.errors:
+            self.stderr.write(f"row {error['row']}: {error['error']}")
+        summary = {key: value for key, value in report.as_dict().items() if key != "errors"}
+        self.stdout.write(json.dumps(summary))
@@ -0,0 +1,33 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from catalog.images import enqueue, process_next_job
+from catalog.models import Category, ImageDerivativeJob, ProductImage
+
+
+class Command(BaseCommand):
+    help = "Run the image derivative worker."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Drain due jobs and exit.")
+        parser.add_argument(
+            "--backfill", action="store_true", help="Queue every category and product image first."
+        )
+
+    def handle(self, *args, **options):
+        if options["backfill"]:
+            category_ids = Category.objects.exclude(image="").exclude(image__isnull=True).values_list("id", flat=True)
+            enqueue(ImageDerivativeJob.Target.CATEGORY, category_ids)
+            enqueue(ImageDerivativeJob.Target.PRODUCT_IMAGE, ProductImage.objects.values_list("id", flat=True))
+
+        processed = 0
+        while True:
+            if process_next_job():
+                processed += 1
+                continue
+            if options["once"]:
+                break
+            time.sleep(settings.CATALOG_IMAGE_POLL_INTERVAL)
+        self.stdout.write(f"Processed {processed} image job(s).")
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.27 on 2026-10-17 10:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0003_productvariant_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['name', 'id'], name='idx_product_name_id'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['created_at', 'id'], name='idx_product_created_id'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['status', 'name', 'id'], name='idx_product_status_name_id'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['category', 'name', 'id'], name='idx_product_cat_name_id'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['seller_id', 'name', 'id'], name='idx_product_seller_name_id'),
+        ),
+        migrations.AddIndex(
+            model_name='productvariant',
+            index=models.Index(fields=['product', 'status', 'price'], name='idx_variant_prod_status_price'),
+        ),
+        migrations.AddIndex(
+            model_name='productattribute',
+            index=models.Index(fields=['attribute', 'value'], name='idx_prodattr_attr_value'),
+        ),
+    ]
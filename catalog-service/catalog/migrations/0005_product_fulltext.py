@@ -0,0 +1,17 @@
+# Generated by Django 4.2.27 on 2026-10-17 10:31
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0004_product_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="ALTER TABLE catalog_product ADD FULLTEXT INDEX ft_product_name_description (name, description)",
+            reverse_sql="ALTER TABLE catalog_product DROP INDEX ft_product_name_description",
+        ),
+    ]
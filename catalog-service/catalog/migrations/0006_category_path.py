@@ -0,0 +1,44 @@
+# Generated by Django 4.2.27 on 2026-10-17 13:20
+
+from django.db import migrations, models
+
+
+def fill_category_paths(apps, schema_editor):
+    Category = apps.get_model('catalog', 'Category')
+    parents = dict(Category.objects.values_list('id', 'parent_id'))
+
+    def chain(pk):
+        ids, seen = [], set()
+        while pk is not None and pk not in seen:
+            seen.add(pk)
+            ids.append(pk)
+            pk = parents.get(pk)
+        return list(reversed(ids))
+
+    for pk in parents:
+        ids = chain(pk)
+        Category.objects.filter(pk=pk).update(
+            path='/' + ''.join(f'{item}/' for item in ids),
+            depth=len(ids) - 1,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0005_product_fulltext'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='path',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_category_paths, migrations.RunPython.noop),
+    ]
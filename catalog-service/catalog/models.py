@@ -1,7 +1,10 @@
 import os
 import uuid
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Concat, Substr
+from django.utils import timezone
 
 
 def category_image_path(instance: "Category", filename: str) -> str:
@@ -14,9 +17,14 @@ class Category(models.Model):
     name = models.CharField(max_length=255)
     slug = models.SlugField(max_length=255, unique=True)
     image = models.ImageField(upload_to=category_image_path, blank=True, null=True)
+    # {"source": <image name>, "webp": {"<width>": <storage name>}, "jpeg": {...}}; see catalog.images.
+    image_derivatives = models.JSONField(default=dict, blank=True, editable=False)
     parent = models.ForeignKey(
         "self", null=True, blank=True, related_name="children", on_delete=models.SET_NULL
     )
+    # Materialized path of ids from the root, e.g. "/1/4/9/"; maintained in save().
+    path = models.CharField(max_length=255, default="", editable=False, db_index=True)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -26,6 +34,42 @@ class Category(models.Model):
     def __str__(self) -> str:
         return self.name
 
+    @property
+    def ancestor_ids(self) -> list[int]:
+        return [int(pk) for pk in self.path.strip("/").split("/") if pk][:-1]
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.sync_path()
+
+    def sync_path(self) -> None:
+        """Derive path/depth from the parent and carry the subtree along when they change."""
+        with transaction.atomic():
+            old_path, old_depth = self.path, self.depth
+            parent_path, parent_depth = "/", -1
+            if self.parent_id is not None:
+                parent_path, parent_depth = (
+                    Category.objects.filter(pk=self.parent_id).values_list("path", "depth").get()
+                )
+                if f"/{self.pk}/" in parent_path:
+                    raise ValueError("A category cannot be moved below one of its descendants.")
+            path, depth = f"{parent_path}{self.pk}/", parent_depth + 1
+            if path == old_path and depth == old_depth:
+                return
+            Category.objects.filter(pk=self.pk).update(path=path, depth=depth)
+            if old_path:
+                move_subtree(old_path, path, depth - old_depth)
+            self.path, self.depth = path, depth
+
+
+def move_subtree(old_prefix: str, new_prefix: str, depth_delta: int) -> None:
+    """Rewrite the paths of every category below `old_prefix` in one UPDATE."""
+    Category.objects.filter(path__startswith=old_prefix).exclude(path=old_prefix).update(
+        path=Concat(Value(new_prefix), Substr("path", len(old_prefix) + 1)),
+        depth=F("depth") + depth_delta,
+    )
+
 
 class Product(models.Model):
     class Status(models.TextChoices):
@@ -52,6 +96,13 @@ class Product(models.Model):
                 name="uniq_product_seller_slug",
             )
         ]
+        indexes = [
+            models.Index(fields=["name", "id"], name="idx_product_name_id"),
+            models.Index(fields=["created_at", "id"], name="idx_product_created_id"),
+            models.Index(fields=["status", "name", "id"], name="idx_product_status_name_id"),
+            models.Index(fields=["category", "name", "id"], name="idx_product_cat_name_id"),
+            models.Index(fields=["seller_id", "name", "id"], name="idx_product_seller_name_id"),
+        ]
 
     def __str__(self) -> str:
         return self.name
@@ -66,6 +117,7 @@ class ProductVariant(models.Model):
     sku = models.CharField(max_length=64)
     price = models.DecimalField(max_digits=12, decimal_places=2)
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.ACTIVE)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         constraints = [
@@ -74,6 +126,9 @@ class ProductVariant(models.Model):
                 name="uniq_variant_product_sku",
             )
         ]
+        indexes = [
+            models.Index(fields=["product", "status", "price"], name="idx_variant_prod_status_price"),
+        ]
 
     def __str__(self) -> str:
         return self.sku
@@ -93,6 +148,9 @@ class ProductAttribute(models.Model):
 
     class Meta:
         unique_together = ("product", "attribute")
+        indexes = [
+            models.Index(fields=["attribute", "value"], name="idx_prodattr_attr_value"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.product_id}:{self.attribute_id}"
@@ -102,9 +160,38 @@ class ProductImage(models.Model):
     product = models.ForeignKey(Product, related_name="images", on_delete=models.CASCADE)
     url = models.URLField(max_length=1024)
     position = models.PositiveIntegerField(default=0)
+    derivatives = models.JSONField(default=dict, blank=True, editable=False)
 
     class Meta:
         ordering = ["position", "id"]
 
     def __str__(self) -> str:
         return self.url
+
+
+class ImageDerivativeJob(models.Model):
+    class Target(models.TextChoices):
+        CATEGORY = "category", "Category"
+        PRODUCT_IMAGE = "product_image", "Product image"
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    target = models.CharField(max_length=20, choices=Target.choices)
+    object_id = models.BigIntegerField()
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "available_at", "id"], name="idx_imagejob_status_avail"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.target}:{self.object_id}"
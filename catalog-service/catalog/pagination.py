@@ -0,0 +1,134 @@
+import base64
+import json
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class ProductCursorPagination(BasePagination):
+    """Keyset pagination on `(sort field, id)`; `?sort=` picks one of the indexed orderings.
+
+    The cursor holds the sort value and id of the row at the page edge, and the
+    next page seeks past it with `field > v OR (field = v AND id > pk)`, so deep
+    pages and long runs of equal names are both index range scans, never OFFSET.
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+    ordering = ("name", "id")
+    sort_orderings = {
+        "name": ("name", "id"),
+        "-name": ("-name", "-id"),
+        "created_at": ("created_at", "id"),
+        "-created_at": ("-created_at", "-id"),
+    }
+
+    def get_ordering(self, request, queryset, view):
+        return self.sort_orderings.get(request.query_params.get("sort"), self.ordering)
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(page_size, self.max_page_size) if page_size > 0 else self.page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.field = self.ordering[0].lstrip("-")
+        descending = self.ordering[0].startswith("-")
+
+        position, reverse = self.decode_cursor(request)
+        # A reverse cursor walks back from `position` in the opposite order, then flips the page.
+        ordering = [_flip(field) for field in self.ordering] if reverse else list(self.ordering)
+        if position is not None:
+            value, pk = position
+            after = "lt" if descending != reverse else "gt"
+            queryset = queryset.filter(
+                Q(**{f"{self.field}__{after}": value}) | Q(**{self.field: value, f"id__{after}": pk})
+            )
+        rows = list(queryset.order_by(*ordering)[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        page = rows[: self.page_size]
+        if reverse:
+            page.reverse()
+
+        first = self._position(page[0]) if page else position
+        last = self._position(page[-1]) if page else position
+        self.has_next = has_more if not reverse else position is not None
+        self.has_previous = has_more if reverse else position is not None
+        self.next_position, self.previous_position = last, first
+        return page
+
+    def _position(self, row):
+        return getattr(row, self.field), row.pk
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")).decode("utf-8"))
+            value, pk = payload["p"]
+            if self.field == "created_at":
+                value = parse_datetime(value)
+                if value is None:
+                    raise ValueError(value)
+            elif not isinstance(value, str):
+                raise ValueError(value)
+            return (value, int(pk)), bool(payload.get("r"))
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, position, reverse: bool) -> str:
+        value, pk = position
+        if hasattr(value, "isoformat"):
+            value = value.isoformat()
+        payload = json.dumps({"p": [value, pk], "r": int(reverse)}, separators=(",", ":"))
+        encoded = base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or self.previous_position is None:
+            return None
+        return self.encode_cursor(self.previous_position, reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+def _flip(field: str) -> str:
+    return field[1:] if field.startswith("-") else f"-{field}"
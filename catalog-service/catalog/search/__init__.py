@@ -0,0 +1,22 @@
+import threading
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .base import SearchBackend
+
+_backend: SearchBackend | None = None
+_backend_lock = threading.Lock()
+
+
+def get_search_backend() -> SearchBackend:
+    """Process-wide backend chosen by `CATALOG_SEARCH_BACKEND` (a dotted class path)."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = import_string(settings.CATALOG_SEARCH_BACKEND)()
+    return _backend
+
+
+__all__ = ["SearchBackend", "get_search_backend"]
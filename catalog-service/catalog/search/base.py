@@ -0,0 +1,42 @@
+from abc import ABC, abstractmethod
+
+from django.conf import settings
+
+
+def price_buckets() -> list[tuple]:
+    bounds = settings.CATALOG_SEARCH_PRICE_BUCKETS
+    edges = [0, *bounds]
+    return [(low, high) for low, high in zip(edges, [*bounds, None])]
+
+
+class SearchBackend(ABC):
+    """Product search contract shared by the MySQL, in-memory and future external engines.
+
+    `search` returns `{"query", "mode", "results", "facets"}` where results are
+    serialized products with a `relevance` score.
+    """
+
+    modes = ("natural", "boolean")
+
+    @abstractmethod
+    def search(self, queryset, query: str, mode: str = "natural", limit: int | None = None) -> dict:
+        raise NotImplementedError
+
+    @abstractmethod
+    def autocomplete(self, prefix: str, limit: int = 10) -> list[str]:
+        raise NotImplementedError
+
+    def warm(self) -> None:
+        """Called once per server process at startup."""
+
+    def index_products(self, product_ids) -> None:
+        """Refresh the given products from the database (deleted ids are dropped)."""
+
+    def index_categories(self, category_ids) -> None:
+        """Refresh products filed under the given categories or their descendants."""
+
+    def rebuild(self) -> None:
+        """Rebuild the whole index from the database."""
+
+    def snapshot(self) -> None:
+        """Persist the index so the next start can skip a full rebuild."""
@@ -0,0 +1,405 @@
+import logging
+import math
+import os
+import pickle
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import F, Max
+
+from ..models import Category, Product, ProductVariant
+from ..serializers import ProductSerializer
+from .base import SearchBackend, price_buckets
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+NAME_WEIGHT = 3
+BM25_K1 = 1.2
+BM25_B = 0.75
+AUTOCOMPLETE_SCAN_LIMIT = 500
+
+
+def _fold(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text.lower()).replace("đ", "d")
+    return "".join(char for char in text if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_RE.findall(_fold(text or ""))
+
+
+@dataclass
+class Document:
+    terms: dict[str, int]
+    length: int
+    category_id: int | None
+    category_path: tuple[int, ...]
+    attributes: dict[str, str]
+    prices: tuple[Decimal, ...]
+
+
+@dataclass
+class IndexState:
+    documents: dict[int, Document] = field(default_factory=dict)
+    postings: dict[str, dict[int, int]] = field(default_factory=lambda: defaultdict(dict))
+    total_length: int = 0
+    category_names: dict[int, str] = field(default_factory=dict)
+    watermark: datetime | None = None
+
+
+def _path_ids(path: str) -> tuple[int, ...]:
+    """Ids from the root down to the category itself, from its materialized path."""
+    return tuple(int(pk) for pk in path.strip("/").split("/") if pk)
+
+
+def _category_names(product_ids=None) -> dict[int, str]:
+    categories = Category.objects.all()
+    if product_ids is not None:
+        # Only the categories above the given products, so an incremental update never scans the tree.
+        paths = Product.objects.filter(pk__in=product_ids, category__isnull=False).values_list(
+            "category__path", flat=True
+        )
+        categories = categories.filter(pk__in={pk for path in paths for pk in _path_ids(path)})
+    return dict(categories.values_list("id", "name"))
+
+
+def _load_documents(product_ids=None) -> tuple[dict[int, Document], dict[int, str]]:
+    if product_ids is not None:
+        product_ids = list(product_ids)
+    names = _category_names(product_ids)
+    products = Product.objects.annotate(category_path_value=F("category__path")).prefetch_related(
+        "variants", "attributes__attribute"
+    )
+    if product_ids is not None:
+        products = products.filter(pk__in=product_ids)
+
+    documents: dict[int, Document] = {}
+    for product in products.iterator(chunk_size=500):
+        category_path = _path_ids(product.category_path_value or "")
+        attributes = {pa.attribute.name: pa.value for pa in product.attributes.all()}
+        terms: Counter = Counter()
+        for token in tokenize(product.name):
+            terms[token] += NAME_WEIGHT
+        terms.update(tokenize(product.description))
+        terms.update(token for value in attributes.values() for token in tokenize(value))
+        terms.update(token for pk in category_path for token in tokenize(names.get(pk, "")))
+        documents[product.pk] = Document(
+            terms=dict(terms),
+            length=sum(terms.values()),
+            category_id=product.category_id,
+            category_path=category_path,
+            attributes=attributes,
+            prices=tuple(
+                variant.price
+                for variant in product.variants.all()
+                if variant.status == ProductVariant.Status.ACTIVE
+            ),
+        )
+    return documents, names
+
+
+class InMemorySearchBackend(SearchBackend):
+    """Inverted index over product text, attributes and category paths.
+
+    Ranking is BM25 with product names weighted higher than the rest. The index
+    lives in each worker process, follows model signals incrementally and is
+    pickled to `CATALOG_SEARCH_SNAPSHOT_PATH` so restarts only replay products
+    changed since the snapshot.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._state = IndexState()
+        self._sorted_terms: list[str] | None = None
+        self._loaded = False
+        self._pending_changes = 0
+
+    # -- lifecycle -----------------------------------------------------------
+
+    def warm(self) -> None:
+        threading.Thread(target=self._ensure_loaded, name="search-index-warm", daemon=True).start()
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            if self._load_snapshot():
+                self._catch_up()
+            else:
+                self._rebuild_locked()
+                self._write_snapshot()
+            self._loaded = True
+
+    def rebuild(self) -> None:
+        with self._lock:
+            self._rebuild_locked()
+            self._loaded = True
+
+    def _rebuild_locked(self) -> None:
+        documents, names = _load_documents()
+        self._state = IndexState(category_names=names)
+        for product_id, document in documents.items():
+            self._add(product_id, document)
+        self._state.watermark = Product.objects.aggregate(latest=Max("updated_at"))["latest"]
+        self._sorted_terms = None
+
+    def _catch_up(self) -> None:
+        watermark = self._state.watermark
+        live_ids = set(Product.objects.values_list("id", flat=True))
+        changed = set()
+        if watermark is not None:
+            changed = set(Product.objects.filter(updated_at__gt=watermark).values_list("id", flat=True))
+        missing = live_ids - set(self._state.documents)
+        deleted = set(self._state.documents) - live_ids
+        self._apply(changed | missing | deleted)
+        self._state.watermark = Product.objects.aggregate(latest=Max("updated_at"))["latest"]
+        logger.info("Search index caught up: %d changed, %d deleted", len(changed | missing), len(deleted))
+
+    # -- snapshots -----------------------------------------------------------
+
+    def snapshot(self) -> None:
+        with self._lock:
+            self._write_snapshot()
+
+    def _write_snapshot(self) -> None:
+        path = settings.CATALOG_SEARCH_SNAPSHOT_PATH
+        if not path:
+            return
+        state = self._state
+        payload = pickle.dumps(
+            {
+                "version": SNAPSHOT_VERSION,
+                "documents": state.documents,
+                "postings": dict(state.postings),
+                "total_length": state.total_length,
+                "category_names": state.category_names,
+                "watermark": state.watermark,
+            },
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Per-process temp name: workers snapshotting at once must not write into each other's file.
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as handle:
+                handle.write(payload)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._pending_changes = 0
+
+    def _load_snapshot(self) -> bool:
+        path = settings.CATALOG_SEARCH_SNAPSHOT_PATH
+        if not path or not os.path.exists(path):
+            return False
+        try:
+            with open(path, "rb") as handle:
+                data = pickle.load(handle)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            logger.warning("Ignoring unreadable search snapshot at %s", path)
+            return False
+        if data.get("version") != SNAPSHOT_VERSION:
+            return False
+        self._state = IndexState(
+            documents=data["documents"],
+            postings=defaultdict(dict, data["postings"]),
+            total_length=data["total_length"],
+            category_names=data["category_names"],
+            watermark=data["watermark"],
+        )
+        self._sorted_terms = None
+        return True
+
+    # -- incremental updates -------------------------------------------------
+
+    def index_products(self, product_ids) -> None:
+        if not self._loaded:
+            # The initial load reads the current rows anyway.
+            return
+        with self._lock:
+            self._apply(set(product_ids))
+            self._pending_changes += len(product_ids)
+            if self._pending_changes >= settings.CATALOG_SEARCH_SNAPSHOT_EVERY:
+                self._pending_changes = 0
+                threading.Thread(target=self.snapshot, name="search-index-snapshot", daemon=True).start()
+
+    def index_categories(self, category_ids) -> None:
+        if not self._loaded:
+            return
+        category_ids = set(category_ids)
+        with self._lock:
+            affected = {
+                product_id
+                for product_id, document in self._state.documents.items()
+                if category_ids.intersection(document.category_path)
+                or document.category_id in category_ids
+            }
+        self.index_products(affected)
+
+    def _apply(self, product_ids: set[int]) -> None:
+        if not product_ids:
+            return
+        documents, names = _load_documents(product_ids)
+        self._state.category_names.update(names)
+        for product_id in product_ids:
+            self._remove(product_id)
+            if product_id in documents:
+                self._add(product_id, documents[product_id])
+        self._sorted_terms = None
+
+    def _add(self, product_id: int, document: Document) -> None:
+        state = self._state
+        state.documents[product_id] = document
+        state.total_length += document.length
+        for term, frequency in document.terms.items():
+            state.postings[term][product_id] = frequency
+
+    def _remove(self, product_id: int) -> None:
+        state = self._state
+        document = state.documents.pop(product_id, None)
+        if document is None:
+            return
+        state.total_length -= document.length
+        for term in document.terms:
+            posting = state.postings.get(term)
+            if posting is None:
+                continue
+            posting.pop(product_id, None)
+            if not posting:
+                del state.postings[term]
+
+    # -- queries -------------------------------------------------------------
+
+    def _expand(self, token: str) -> list[str]:
+        if token.endswith("*"):
+            return self._terms_with_prefix(token[:-1], AUTOCOMPLETE_SCAN_LIMIT)
+        return [token]
+
+    def _terms_with_prefix(self, prefix: str, limit: int) -> list[str]:
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self._state.postings)
+        terms = self._sorted_terms
+        found = []
+        for position in range(bisect_left(terms, prefix), len(terms)):
+            if not terms[position].startswith(prefix) or len(found) >= limit:
+                break
+            found.append(terms[position])
+        return found
+
+    def _parse(self, query: str, mode: str) -> tuple[list[str], list[list[str]], list[str]]:
+        optional: list[str] = []
+        required: list[list[str]] = []
+        excluded: list[str] = []
+        for raw in query.split():
+            operator = raw[0] if mode == "boolean" and raw[0] in "+-" else ""
+            body = raw[1:] if operator else raw
+            wildcard = mode == "boolean" and body.endswith("*")
+            for token in tokenize(body):
+                expanded = self._expand(token + "*" if wildcard else token)
+                if operator == "+":
+                    required.append(expanded)
+                elif operator == "-":
+                    excluded.extend(expanded)
+                else:
+                    optional.extend(expanded)
+        return optional, required, excluded
+
+    def _score(self, query: str, mode: str) -> dict[int, float]:
+        state = self._state
+        count = len(state.documents)
+        if not count:
+            return {}
+        average_length = state.total_length / count
+        optional, required, excluded = self._parse(query, mode)
+
+        scores: dict[int, float] = defaultdict(float)
+        for term in {*optional, *(term for group in required for term in group)}:
+            posting = state.postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (count - len(posting) + 0.5) / (len(posting) + 0.5))
+            for product_id, frequency in posting.items():
+                length = state.documents[product_id].length
+                norm = frequency + BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                scores[product_id] += idf * frequency * (BM25_K1 + 1) / norm
+
+        for group in required:
+            matching = set().union(*(state.postings.get(term, {}).keys() for term in group))
+            scores = {product_id: score for product_id, score in scores.items() if product_id in matching}
+        for term in excluded:
+            for product_id in state.postings.get(term, {}):
+                scores.pop(product_id, None)
+        return dict(scores)
+
+    def _facets(self, product_ids) -> dict:
+        state = self._state
+        categories: Counter = Counter()
+        attributes: dict[str, Counter] = defaultdict(Counter)
+        buckets = price_buckets()
+        prices = [0] * len(buckets)
+        for product_id in product_ids:
+            document = state.documents[product_id]
+            if document.category_id is not None:
+                categories[document.category_id] += 1
+            for name, value in document.attributes.items():
+                attributes[name][value] += 1
+            for index, (low, high) in enumerate(buckets):
+                if any(price >= low and (high is None or price < high) for price in document.prices):
+                    prices[index] += 1
+        return {
+            "categories": [
+                {"id": pk, "name": state.category_names.get(pk), "count": total}
+                for pk, total in categories.most_common()
+            ],
+            "attributes": {
+                name: [{"value": value, "count": total} for value, total in values.most_common()]
+                for name, values in attributes.items()
+            },
+            "price": [
+                {"min": low, "max": high, "count": prices[index]}
+                for index, (low, high) in enumerate(buckets)
+            ],
+        }
+
+    def search(self, queryset, query: str, mode: str = "natural", limit: int | None = None) -> dict:
+        self._ensure_loaded()
+        with self._lock:
+            scores = self._score(query, mode)
+        # Filters (status, seller, price, ...) still come from the database.
+        allowed = set(queryset.filter(pk__in=list(scores)).values_list("pk", flat=True)) if scores else set()
+        limit = limit or settings.CATALOG_SEARCH_MAX_RESULTS
+        ranked = sorted(allowed, key=lambda pk: (-scores[pk], pk))[:limit]
+        products = queryset.in_bulk(ranked)
+        results = []
+        for pk in ranked:
+            if pk not in products:
+                continue
+            row = ProductSerializer(products[pk]).data
+            row["relevance"] = scores[pk]
+            results.append(row)
+        with self._lock:
+            facets = self._facets(pk for pk in allowed if pk in self._state.documents)
+        return {"query": query, "mode": mode, "results": results, "facets": facets}
+
+    def autocomplete(self, prefix: str, limit: int = 10) -> list[str]:
+        self._ensure_loaded()
+        tokens = tokenize(prefix)
+        if not tokens:
+            return []
+        with self._lock:
+            candidates = self._terms_with_prefix(tokens[-1], AUTOCOMPLETE_SCAN_LIMIT)
+            candidates.sort(key=lambda term: (-len(self._state.postings[term]), term))
+        return candidates[:limit]
@@ -0,0 +1,80 @@
+from django.conf import settings
+from django.db.models import Count, Q
+from django.db.models.expressions import RawSQL
+
+from ..models import Product, ProductVariant
+from ..serializers import ProductSerializer
+from .base import SearchBackend, price_buckets
+
+SEARCH_MODES = {
+    "natural": "IN NATURAL LANGUAGE MODE",
+    "boolean": "IN BOOLEAN MODE",
+}
+
+
+def category_facets(matches) -> list[dict]:
+    rows = (
+        matches.order_by()
+        .values("category_id", "category__name")
+        .annotate(count=Count("id"))
+        .order_by("-count")
+    )
+    return [
+        {"id": row["category_id"], "name": row["category__name"], "count": row["count"]}
+        for row in rows
+    ]
+
+
+def price_facets(matches) -> list[dict]:
+    buckets = price_buckets()
+    aggregates = {
+        f"bucket_{index}": Count(
+            "product",
+            distinct=True,
+            filter=Q(price__gte=low) & (Q(price__lt=high) if high is not None else Q()),
+        )
+        for index, (low, high) in enumerate(buckets)
+    }
+    counts = ProductVariant.objects.filter(
+        product__in=matches.order_by().values("id"), status=ProductVariant.Status.ACTIVE
+    ).aggregate(**aggregates)
+    return [
+        {"min": low, "max": high, "count": counts[f"bucket_{index}"]}
+        for index, (low, high) in enumerate(buckets)
+    ]
+
+
+def fulltext_search(queryset, query: str, mode: str = "natural", limit: int | None = None) -> dict:
+    """Rank `queryset` by MySQL FULLTEXT relevance on (name, description)."""
+    relevance = RawSQL(
+        f"MATCH ({Product._meta.db_table}.name, {Product._meta.db_table}.description) "
+        f"AGAINST (%s {SEARCH_MODES[mode]})",
+        [query],
+    )
+    matches = queryset.annotate(relevance=relevance).filter(relevance__gt=0)
+    limit = limit or settings.CATALOG_SEARCH_MAX_RESULTS
+    ranked = matches.order_by("-relevance", "id")[:limit]
+    results = []
+    for product in ranked:
+        row = ProductSerializer(product).data
+        row["relevance"] = product.relevance
+        results.append(row)
+    return {
+        "query": query,
+        "mode": mode,
+        "results": results,
+        "facets": {"categories": category_facets(matches), "price": price_facets(matches)},
+    }
+
+
+class MySQLFullTextBackend(SearchBackend):
+    def search(self, queryset, query: str, mode: str = "natural", limit: int | None = None) -> dict:
+        return fulltext_search(queryset, query, mode, limit)
+
+    def autocomplete(self, prefix: str, limit: int = 10) -> list[str]:
+        return list(
+            Product.objects.filter(name__istartswith=prefix)
+            .order_by("name")
+            .values_list("name", flat=True)
+            .distinct()[:limit]
+        )
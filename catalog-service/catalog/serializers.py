@@ -1,3 +1,6 @@
+import json
+
+from django.core.files.storage import default_storage
 from rest_framework import serializers
 from .models import (
     Category,
@@ -9,22 +12,62 @@ from .models import (
 )
 
 
+def derivative_urls(derivatives: dict, request=None) -> dict[str, dict[str, str]]:
+    """`{format: {width: url}}` from a stored derivatives map; empty until the worker has run."""
+    urls = {}
+    for fmt, by_width in (derivatives or {}).items():
+        if fmt == "source":
+            continue
+        urls[fmt] = {}
+        for width, name in by_width.items():
+            url = default_storage.url(name)
+            urls[fmt][width] = request.build_absolute_uri(url) if request else url
+    return urls
+
+
 class CategorySerializer(serializers.ModelSerializer):
+    image_derivatives = serializers.SerializerMethodField()
+
     class Meta:
         model = Category
-        fields = ["id", "name", "slug", "image", "parent", "created_at", "updated_at"]
+        fields = [
+            "id",
+            "name",
+            "slug",
+            "image",
+            "image_derivatives",
+            "parent",
+            "path",
+            "depth",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = ["path", "depth"]
+
+    def get_image_derivatives(self, obj) -> dict[str, dict[str, str]]:
+        return derivative_urls(obj.image_derivatives, self.context.get("request"))
+
+    def validate_parent(self, parent):
+        if parent and self.instance and f"/{self.instance.pk}/" in parent.path:
+            raise serializers.ValidationError("A category cannot be moved below one of its descendants.")
+        return parent
 
 
 class ProductImageSerializer(serializers.ModelSerializer):
+    derivatives = serializers.SerializerMethodField()
+
     class Meta:
         model = ProductImage
-        fields = ["id", "url", "position"]
+        fields = ["id", "url", "position", "derivatives"]
+
+    def get_derivatives(self, obj) -> dict[str, dict[str, str]]:
+        return derivative_urls(obj.derivatives, self.context.get("request"))
 
 
 class ProductVariantSerializer(serializers.ModelSerializer):
     class Meta:
         model = ProductVariant
-        fields = ["id", "sku", "price", "status"]
+        fields = ["id", "sku", "price", "status", "updated_at"]
 
 
 class ProductSerializer(serializers.ModelSerializer):
@@ -46,6 +89,7 @@ class ProductSerializer(serializers.ModelSerializer):
 class ProductDetailSerializer(serializers.ModelSerializer):
     variants = ProductVariantSerializer(many=True, read_only=True)
     images = ProductImageSerializer(many=True, read_only=True)
+    attributes = serializers.SerializerMethodField()
 
     class Meta:
         model = Product
@@ -61,8 +105,49 @@ class ProductDetailSerializer(serializers.ModelSerializer):
             "updated_at",
             "variants",
             "images",
+            "attributes",
+        ]
+
+    def get_attributes(self, obj) -> dict[str, str]:
+        return {item.attribute.name: item.value for item in obj.attributes.all()}
+
+
+class ProductCardSerializer(serializers.ModelSerializer):
+    """Listing tile built from `cards.with_card_fields` annotations."""
+
+    min_price = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
+    max_price = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
+    primary_image = serializers.CharField(read_only=True)
+    primary_image_derivatives = serializers.SerializerMethodField()
+    attributes = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Product
+        fields = [
+            "id",
+            "seller_id",
+            "name",
+            "slug",
+            "status",
+            "category",
+            "updated_at",
+            "min_price",
+            "max_price",
+            "primary_image",
+            "primary_image_derivatives",
+            "attributes",
         ]
 
+    def get_primary_image_derivatives(self, obj) -> dict[str, dict[str, str]]:
+        return derivative_urls(obj.primary_image_derivatives, self.context.get("request"))
+
+    def get_attributes(self, obj) -> dict[str, str]:
+        # MySQL hands JSON_OBJECTAGG back as text.
+        value = obj.attribute_map
+        if isinstance(value, (str, bytes)):
+            value = json.loads(value)
+        return value or {}
+
 
 class AttributeSerializer(serializers.ModelSerializer):
     class Meta:
@@ -71,6 +156,8 @@ class AttributeSerializer(serializers.ModelSerializer):
 
 
 class ProductAttributeSerializer(serializers.ModelSerializer):
+    attribute_name = serializers.CharField(source="attribute.name", read_only=True)
+
     class Meta:
         model = ProductAttribute
-        fields = ["id", "product", "attribute", "value"]
+        fields = ["id", "product", "attribute", "attribute_name", "value"]
@@ -0,0 +1,94 @@
+import threading
+from contextlib import contextmanager
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import invalidate_category_tree, invalidate_product_lists, product_detail_key
+from .images import enqueue, needs_derivatives
+from .models import (
+    Category,
+    ImageDerivativeJob,
+    Product,
+    ProductAttribute,
+    ProductImage,
+    ProductVariant,
+    move_subtree,
+)
+from .search import get_search_backend
+
+_bulk = threading.local()
+
+
+@contextmanager
+def bulk_writes():
+    """Skip the per-row product hooks below; the caller calls refresh_products() once instead."""
+    _bulk.active = True
+    try:
+        yield
+    finally:
+        _bulk.active = False
+
+
+def refresh_products(product_ids) -> None:
+    product_ids = list(product_ids)
+    cache.delete_many([product_detail_key(product_id) for product_id in product_ids])
+    invalidate_product_lists()
+    get_search_backend().index_products(product_ids)
+
+
+def _invalidate_on_commit(product_id) -> None:
+    transaction.on_commit(lambda: refresh_products([product_id]))
+
+
+@receiver([post_save, post_delete], sender=Product)
+def product_changed(sender, instance, **kwargs):
+    if getattr(_bulk, "active", False):
+        return
+    _invalidate_on_commit(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=ProductVariant)
+@receiver([post_save, post_delete], sender=ProductImage)
+@receiver([post_save, post_delete], sender=ProductAttribute)
+def product_child_changed(sender, instance, **kwargs):
+    if getattr(_bulk, "active", False):
+        return
+    # Keep the parent's updated_at (and so its ETag) in step with nested variants/images/attributes.
+    Product.objects.filter(pk=instance.product_id).update(updated_at=timezone.now())
+    _invalidate_on_commit(instance.product_id)
+
+
+@receiver(post_save, sender=ProductImage)
+def product_image_saved(sender, instance, raw=False, **kwargs):
+    if not raw and needs_derivatives(instance):
+        enqueue(ImageDerivativeJob.Target.PRODUCT_IMAGE, [instance.pk])
+
+
+def _category_changed_on_commit(category_id) -> None:
+    invalidate_category_tree()
+    # Category names are part of the indexed text of every product filed below them.
+    get_search_backend().index_categories([category_id])
+
+
+@receiver(post_save, sender=Category)
+def category_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        # loaddata bypasses Category.save().
+        instance.sync_path()
+    elif needs_derivatives(instance):
+        enqueue(ImageDerivativeJob.Target.CATEGORY, [instance.pk])
+    category_id = instance.pk
+    transaction.on_commit(lambda: _category_changed_on_commit(category_id))
+
+
+@receiver(post_delete, sender=Category)
+def category_deleted(sender, instance, **kwargs):
+    # Children were detached (SET_NULL); lift the whole subtree up to the root.
+    if instance.path:
+        move_subtree(instance.path, "/", -(instance.depth + 1))
+    category_id = instance.pk
+    transaction.on_commit(lambda: _category_changed_on_commit(category_id))
@@ -0,0 +1,72 @@
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from .models import Attribute, Category, Product, ProductAttribute, ProductImage, ProductVariant
+
+DUMMY_CACHE = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+
+
+class DetailLookupTests(TestCase):
+    def test_non_numeric_pk_is_not_found(self):
+        for resource in ("products", "categories", "variants"):
+            with self.subTest(resource=resource):
+                self.assertEqual(self.client.get(f"/v1/{resource}/abc/").status_code, 404)
+
+    def test_missing_pk_is_not_found(self):
+        for resource in ("products", "categories", "variants"):
+            with self.subTest(resource=resource):
+                self.assertEqual(self.client.get(f"/v1/{resource}/999999/").status_code, 404)
+
+
+@override_settings(CACHES=DUMMY_CACHE)
+class QueryCountTests(TestCase):
+    """Read endpoints must issue the same number of queries whatever the page or nesting size."""
+
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(name="Shoes", slug="shoes")
+        attributes = [Attribute.objects.create(name=f"attr-{index}") for index in range(3)]
+        cls.products = []
+        for index in range(12):
+            product = Product.objects.create(
+                seller_id=1,
+                name=f"Product {index:02d}",
+                slug=f"product-{index}",
+                status=Product.Status.PUBLISHED,
+                category=category,
+            )
+            # Product 0 has one of each child row, the rest have three.
+            children = 1 if index == 0 else 3
+            for child in range(children):
+                ProductVariant.objects.create(
+                    product=product, sku=f"sku-{child}", price=Decimal("9.99") + child
+                )
+                ProductImage.objects.create(
+                    product=product, url=f"https://img.example/{index}/{child}.jpg", position=child
+                )
+                ProductAttribute.objects.create(
+                    product=product, attribute=attributes[child], value=str(child)
+                )
+            cls.products.append(product)
+
+    def count_queries(self, url: str) -> int:
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        return len(captured.captured_queries)
+
+    def test_list_queries_do_not_grow_with_page_size(self):
+        for path in ("/v1/products/", "/v1/products/cards/"):
+            with self.subTest(path=path):
+                expected = self.count_queries(f"{path}?page_size=1")
+                with self.assertNumQueries(expected):
+                    self.assertEqual(self.client.get(f"{path}?page_size=10").status_code, 200)
+
+    def test_detail_queries_do_not_grow_with_nested_rows(self):
+        single, many = self.products[0], self.products[1]
+        expected = self.count_queries(f"/v1/products/{single.pk}/")
+        with self.assertNumQueries(expected):
+            self.assertEqual(self.client.get(f"/v1/products/{many.pk}/").status_code, 200)
@@ -1,4 +1,7 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
+
+from . import async_views
 from .views import (
     CategoryViewSet,
     ProductViewSet,
@@ -14,4 +17,12 @@ router.register("variants", ProductVariantViewSet, basename="variant")
 router.register("attributes", AttributeViewSet, basename="attribute")
 router.register("product-attributes", ProductAttributeViewSet, basename="product-attribute")
 
-urlpatterns = router.urls
+# Async read-only mirror of the hot GET endpoints, for ASGI deployments.
+read_urlpatterns = [
+    path("read/products/", async_views.ProductListView.as_view()),
+    path("read/products/cards/", async_views.ProductCardsView.as_view()),
+    path("read/products/<int:pk>/", async_views.ProductDetailView.as_view()),
+    path("read/categories/tree/", async_views.CategoryTreeView.as_view()),
+]
+
+urlpatterns = router.urls + read_urlpatterns
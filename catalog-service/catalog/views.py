@@ -1,9 +1,31 @@
+import io
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
 
+from .bulk import CONTENT_TYPES, FORMATS, export_products, import_products
+from .cache import (
+    CATEGORY_TREE_KEY,
+    get_or_compute,
+    product_detail_key,
+    product_list_key,
+    product_search_key,
+)
+from .cards import with_card_fields, with_detail_prefetches
+from .categories import build_category_tree, iter_tree
+from .conditional import ConditionalGetMixin, is_current
+from .filters import ProductFilterBackend
 from .models import Category, Product, ProductVariant, Attribute, ProductAttribute
+from .pagination import ProductCursorPagination
+from .search import get_search_backend
 from .serializers import (
     CategorySerializer,
+    ProductCardSerializer,
     ProductSerializer,
     ProductDetailSerializer,
     ProductVariantSerializer,
@@ -12,26 +34,139 @@ from .serializers import (
 )
 
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [AllowAny]
+    cache_control_resource = "categories"
+
+    @action(detail=False, methods=["get"])
+    def tree(self, request):
+        data = get_or_compute(
+            CATEGORY_TREE_KEY, build_category_tree, timeout=settings.CATALOG_CATEGORY_TREE_CACHE_TTL
+        )
+        return self.content_conditional_response(request, Response(data), iter_tree(data))
+
 
+class ProductCacheMixin:
+    def list(self, request, *args, **kwargs):
+        data = get_or_compute(
+            product_list_key(request.build_absolute_uri()),
+            lambda: super(ProductCacheMixin, self).list(request, *args, **kwargs).data,
+            timeout=settings.CATALOG_LIST_CACHE_TTL,
+        )
+        return Response(data)
 
-class ProductViewSet(viewsets.ModelViewSet):
+    def retrieve(self, request, *args, **kwargs):
+        # A render that raced a write can land in the cache after the on-commit delete;
+        # an entry older than the row's live updated_at is recomputed instead of served.
+        live_updated_at = getattr(self, "live_updated_at", None)
+        data = get_or_compute(
+            product_detail_key(kwargs[self.lookup_field]),
+            lambda: super(ProductCacheMixin, self).retrieve(request, *args, **kwargs).data,
+            timeout=settings.CATALOG_PRODUCT_CACHE_TTL,
+            is_fresh=lambda cached: is_current(cached, live_updated_at),
+        )
+        return Response(data)
+
+
+class ProductViewSet(ConditionalGetMixin, ProductCacheMixin, viewsets.ModelViewSet):
     queryset = Product.objects.all().select_related("category")
     permission_classes = [AllowAny]
+    filter_backends = [ProductFilterBackend]
+    pagination_class = ProductCursorPagination
+    cache_control_resource = "products"
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == "retrieve":
+            return with_detail_prefetches(queryset)
+        if self.action == "cards":
+            return with_card_fields(queryset)
+        return queryset
 
     def get_serializer_class(self):
         if self.action == "retrieve":
             return ProductDetailSerializer
+        if self.action == "cards":
+            return ProductCardSerializer
         return ProductSerializer
 
+    @action(detail=False, methods=["get"])
+    def cards(self, request):
+        def compute():
+            page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+            return self.get_paginated_response(self.get_serializer(page, many=True).data).data
 
-class ProductVariantViewSet(viewsets.ModelViewSet):
+        data = get_or_compute(
+            product_list_key(request.build_absolute_uri()),
+            compute,
+            timeout=settings.CATALOG_LIST_CACHE_TTL,
+        )
+        return self.content_conditional_response(request, Response(data), data["results"])
+
+    @staticmethod
+    def _file_format(value: str | None) -> str:
+        if value not in FORMATS:
+            raise ValidationError({"file_format": f"Must be one of: {', '.join(FORMATS)}."})
+        return value
+
+    @action(detail=False, methods=["post"], url_path="import")
+    def bulk_import(self, request):
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise ValidationError({"file": "Upload a CSV or NDJSON file."})
+        extension = upload.name.rsplit(".", 1)[-1].lower()
+        file_format = self._file_format(request.query_params.get("file_format", extension))
+        try:
+            report = import_products(io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline=""), file_format)
+        except UnicodeDecodeError:
+            raise ValidationError({"file": "File must be UTF-8 encoded."})
+        return Response(report.as_dict())
+
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        file_format = self._file_format(request.query_params.get("file_format", "ndjson"))
+        response = StreamingHttpResponse(
+            export_products(self.filter_queryset(self.get_queryset()), file_format),
+            content_type=CONTENT_TYPES[file_format],
+        )
+        response["Content-Disposition"] = f'attachment; filename="products.{file_format}"'
+        return response
+
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        backend = get_search_backend()
+        query = request.query_params.get("q", "").strip()
+        mode = request.query_params.get("mode", "natural")
+        if not query:
+            raise ValidationError({"q": "This query parameter is required."})
+        if mode not in backend.modes:
+            raise ValidationError({"mode": f"Must be one of: {', '.join(backend.modes)}."})
+        data = get_or_compute(
+            product_search_key(request.META.get("QUERY_STRING", "")),
+            lambda: backend.search(self.filter_queryset(self.get_queryset()), query, mode),
+            timeout=settings.CATALOG_SEARCH_CACHE_TTL,
+        )
+        return Response(data)
+
+    @action(detail=False, methods=["get"])
+    def autocomplete(self, request):
+        prefix = request.query_params.get("q", "").strip()
+        if not prefix:
+            raise ValidationError({"q": "This query parameter is required."})
+        try:
+            limit = min(int(request.query_params.get("limit", 10)), 50)
+        except ValueError:
+            raise ValidationError({"limit": "Must be an integer."})
+        return Response({"query": prefix, "suggestions": get_search_backend().autocomplete(prefix, limit)})
+
+
+class ProductVariantViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = ProductVariant.objects.all().select_related("product")
     serializer_class = ProductVariantSerializer
     permission_classes = [AllowAny]
+    cache_control_resource = "variants"
 
 
 class AttributeViewSet(viewsets.ModelViewSet):
@@ -41,6 +176,15 @@ class AttributeViewSet(viewsets.ModelViewSet):
 
 
 class ProductAttributeViewSet(viewsets.ModelViewSet):
-    queryset = ProductAttribute.objects.all().select_related("product", "attribute")
+    queryset = ProductAttribute.objects.select_related("attribute").order_by("product_id", "attribute__name")
     serializer_class = ProductAttributeSerializer
     permission_classes = [AllowAny]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        product = self.request.query_params.get("product")
+        if product:
+            if not product.isdigit():
+                raise ValidationError({"product": "Must be an integer."})
+            queryset = queryset.filter(product_id=int(product))
+        return queryset
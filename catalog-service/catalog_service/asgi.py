@@ -4,3 +4,7 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "catalog_service.settings")
 
 application = get_asgi_application()
+
+from catalog.search import get_search_backend  # noqa: E402
+
+get_search_backend().warm()
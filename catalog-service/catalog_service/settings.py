@@ -62,6 +62,73 @@ DATABASES = {
     }
 }
 
+CATALOG_REDIS_URL = os.environ.get("CATALOG_REDIS_URL", "redis://redis:6379/1")
+
+if CATALOG_REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CATALOG_REDIS_URL,
+            "KEY_PREFIX": "catalog",
+        }
+    }
+else:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+CATALOG_PRODUCT_CACHE_TTL = int(os.environ.get("CATALOG_PRODUCT_CACHE_TTL", "600"))
+CATALOG_LIST_CACHE_TTL = int(os.environ.get("CATALOG_LIST_CACHE_TTL", "120"))
+CATALOG_CATEGORY_TREE_CACHE_TTL = int(os.environ.get("CATALOG_CATEGORY_TREE_CACHE_TTL", "1800"))
+CATALOG_CACHE_LOCK_TIMEOUT = int(os.environ.get("CATALOG_CACHE_LOCK_TIMEOUT", "10"))
+CATALOG_SEARCH_CACHE_TTL = int(os.environ.get("CATALOG_SEARCH_CACHE_TTL", "60"))
+CATALOG_SEARCH_MAX_RESULTS = int(os.environ.get("CATALOG_SEARCH_MAX_RESULTS", "50"))
+CATALOG_IMPORT_CHUNK_SIZE = int(os.environ.get("CATALOG_IMPORT_CHUNK_SIZE", "500"))
+CATALOG_IMPORT_MAX_ERRORS = int(os.environ.get("CATALOG_IMPORT_MAX_ERRORS", "1000"))
+CATALOG_EXPORT_CHUNK_SIZE = int(os.environ.get("CATALOG_EXPORT_CHUNK_SIZE", "1000"))
+CATALOG_IMAGE_WIDTHS = [
+    int(width) for width in os.environ.get("CATALOG_IMAGE_WIDTHS", "320,640,1280").split(",") if width.strip()
+]
+CATALOG_IMAGE_FORMATS = [
+    fmt.strip() for fmt in os.environ.get("CATALOG_IMAGE_FORMATS", "webp,jpeg").split(",") if fmt.strip()
+]
+CATALOG_IMAGE_QUALITY = int(os.environ.get("CATALOG_IMAGE_QUALITY", "80"))
+CATALOG_IMAGE_MAX_BYTES = int(os.environ.get("CATALOG_IMAGE_MAX_BYTES", str(20 * 1024 * 1024)))
+CATALOG_IMAGE_FETCH_TIMEOUT = int(os.environ.get("CATALOG_IMAGE_FETCH_TIMEOUT", "10"))
+CATALOG_IMAGE_FETCH_HOSTS = [
+    host.strip() for host in os.environ.get("CATALOG_IMAGE_FETCH_HOSTS", "").split(",") if host.strip()
+]
+CATALOG_IMAGE_MAX_ATTEMPTS = int(os.environ.get("CATALOG_IMAGE_MAX_ATTEMPTS", "5"))
+CATALOG_IMAGE_POLL_INTERVAL = float(os.environ.get("CATALOG_IMAGE_POLL_INTERVAL", "2"))
+CATALOG_SEARCH_BACKEND = os.environ.get(
+    "CATALOG_SEARCH_BACKEND", "catalog.search.mysql.MySQLFullTextBackend"
+)
+CATALOG_SEARCH_SNAPSHOT_PATH = os.environ.get(
+    "CATALOG_SEARCH_SNAPSHOT_PATH", str(BASE_DIR / "var" / "search-index.pickle")
+)
+CATALOG_SEARCH_SNAPSHOT_EVERY = int(os.environ.get("CATALOG_SEARCH_SNAPSHOT_EVERY", "500"))
+CATALOG_SEARCH_PRICE_BUCKETS = [
+    int(bound)
+    for bound in os.environ.get(
+        "CATALOG_SEARCH_PRICE_BUCKETS", "100000,500000,1000000,5000000"
+    ).split(",")
+    if bound.strip()
+]
+
+# Cache-Control for catalog GET responses, per resource: (max-age, stale-while-revalidate).
+CATALOG_CACHE_CONTROL = {
+    "products": (
+        int(os.environ.get("CATALOG_PRODUCTS_MAX_AGE", "60")),
+        int(os.environ.get("CATALOG_PRODUCTS_STALE_WHILE_REVALIDATE", "300")),
+    ),
+    "categories": (
+        int(os.environ.get("CATALOG_CATEGORIES_MAX_AGE", "300")),
+        int(os.environ.get("CATALOG_CATEGORIES_STALE_WHILE_REVALIDATE", "3600")),
+    ),
+    "variants": (
+        int(os.environ.get("CATALOG_VARIANTS_MAX_AGE", "30")),
+        int(os.environ.get("CATALOG_VARIANTS_STALE_WHILE_REVALIDATE", "120")),
+    ),
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -0,0 +1,120 @@
+"""Load test for catalog read endpoints: WSGI (sync DRF) vs ASGI (/v1/read/).
+
+Start both servers against the same database and Redis, for example:
+
+    gunicorn catalog_service.wsgi -w 4 -b 127.0.0.1:8001
+    uvicorn catalog_service.asgi:application --workers 4 --port 8002
+
+then run from the catalog-service directory:
+
+    python -m scripts.bench_reads --wsgi http://127.0.0.1:8001 --asgi http://127.0.0.1:8002
+
+Each target gets `--clients` concurrent keep-alive connections for
+`--duration` seconds, spread over the product list, product detail and
+category tree. Prints requests/sec, p50/p99 latency and non-200 counts.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+PATHS = {
+    "wsgi": ["/v1/products/", "/v1/products/{id}/", "/v1/categories/tree/"],
+    "asgi": ["/v1/read/products/", "/v1/read/products/{id}/", "/v1/read/categories/tree/"],
+}
+
+
+async def _request(reader, writer, host: str, path: str) -> int:
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nAccept: application/json\r\n\r\n".encode())
+    await writer.drain()
+    status_line = await reader.readline()
+    status = int(status_line.split()[1])
+    length, chunked = 0, False
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        name = name.strip().lower()
+        if name == "content-length":
+            length = int(value)
+        elif name == "transfer-encoding" and "chunked" in value.lower():
+            chunked = True
+    if chunked:
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    elif length:
+        await reader.readexactly(length)
+    return status
+
+
+async def _client(base: str, paths: list[str], deadline: float, latencies: list[float], errors: list[int]):
+    parts = urlsplit(base)
+    reader, writer = await asyncio.open_connection(parts.hostname, parts.port or 80)
+    index = 0
+    try:
+        while time.perf_counter() < deadline:
+            path = paths[index % len(paths)]
+            index += 1
+            started = time.perf_counter()
+            try:
+                status = await _request(reader, writer, parts.netloc, path)
+            except (ConnectionError, asyncio.IncompleteReadError, ValueError, IndexError):
+                errors.append(0)
+                writer.close()
+                reader, writer = await asyncio.open_connection(parts.hostname, parts.port or 80)
+                continue
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run(base: str, paths: list[str], clients: int, duration: float) -> dict:
+    latencies: list[float] = []
+    errors: list[int] = []
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    await asyncio.gather(*(_client(base, paths, deadline, latencies, errors) for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    ordered = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(ordered) * 1000 if ordered else 0.0,
+        "p99_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000 if ordered else 0.0,
+        "errors": len(errors),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--wsgi", help="Base URL of the WSGI server.")
+    parser.add_argument("--asgi", help="Base URL of the ASGI server.")
+    parser.add_argument("--product-id", type=int, default=1)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=5.0)
+    args = parser.parse_args()
+
+    for name in ("wsgi", "asgi"):
+        base = getattr(args, name)
+        if not base:
+            continue
+        paths = [path.format(id=args.product_id) for path in PATHS[name]]
+        # Warm the shared cache so both runs measure the steady state.
+        asyncio.run(run(base, paths, min(args.clients, 10), args.warmup))
+        result = asyncio.run(run(base, paths, args.clients, args.duration))
+        print(
+            f"{name}: {result['requests']} requests, {result['rps']:.0f} req/s, "
+            f"p50 {result['p50_ms']:.1f} ms, p99 {result['p99_ms']:.1f} ms, {result['errors']} errors"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,18 @@
-from datetime import datetime, timedelta
-from decimal import Decimal
-import asyncio
+from datetime import datetime
 
-from aiokafka import AIOKafkaProducer
-from fastapi import APIRouter, Depends, HTTPException, Request, status
-from sqlalchemy import select, func, text
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select, func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-import redis.asyncio as redis
-
-from app.core.config import settings
-from app.db.models import (
-    Cart,
-    CartItem,
-    CheckoutSession,
-    Order,
-    OrderItem,
-    Promo,
-    PromoRedemption,
-)
-from app.db.session import get_db, engine
+
+from app.core.jwks import TokenInvalid
+from app.db.models import Order, Promo, PromoRedemption
+from app.db.session import get_db
+from app.repositories.cart_repo import CartRepository, get_cart_repository
+from app.repositories.order_repo import OrderRepository
+from app.services.checkout import find_idempotent_checkout, place_order
+from app.services.idempotency import IdempotencyInProgress, get_idempotency_store
+from app.services.outbox import add_order_event
 from app.schemas import (
     CartItemCreate,
     CartItemUpdate,
@@ -26,7 +20,6 @@ from app.schemas import (
     CartOut,
     CheckoutCreate,
     CheckoutOut,
-    OrderItemOut,
     OrderOut,
     PromoValidateIn,
     PromoValidateOut,
@@ -35,7 +28,15 @@ from app.schemas import (
 router = APIRouter()
 
 
-def require_user(request: Request) -> tuple[int, str]:
+async def require_user(request: Request) -> tuple[int, str]:
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        # Verified locally against auth-service's cached JWKS; no call to auth.
+        try:
+            claims = await request.app.state.jwks.verify(token)
+            return int(claims["sub"]), str(claims.get("role") or "customer")
+        except (TokenInvalid, ValueError):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
     user_id = request.session.get("user_id")
     role = request.session.get("role", "customer")
     if not user_id:
@@ -43,107 +44,59 @@ def require_user(request: Request) -> tuple[int, str]:
     return int(user_id), str(role)
 
 
-async def fetch_cart_items(db: AsyncSession, cart_id: int) -> list[CartItemOut]:
-    items = (await db.execute(select(CartItem).where(CartItem.cart_id == cart_id))).scalars().all()
-    return [CartItemOut.model_validate(item) for item in items]
+@router.get("/health")
+async def health(request: Request):
+    return request.app.state.health.snapshot()
+
 
+@router.get("/health/live")
+async def health_live():
+    return {"status": "ok"}
 
-async def compute_cart_total(db: AsyncSession, cart_id: int) -> Decimal:
-    result = await db.execute(
-        select(func.coalesce(func.sum(CartItem.qty * CartItem.unit_price), 0)).where(
-            CartItem.cart_id == cart_id
-        )
-    )
-    return Decimal(str(result.scalar_one()))
 
+@router.get("/health/ready")
+async def health_ready(request: Request, response: Response):
+    snapshot = request.app.state.health.snapshot()
+    if not snapshot["ready"]:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return snapshot
 
-@router.get("/health")
-async def health():
-    status_map: dict[str, str] = {"db": "unknown", "redis": "unknown", "kafka": "unknown"}
-
-    async def check_db():
-        async with engine.connect() as conn:
-            await conn.execute(text("SELECT 1"))
-        status_map["db"] = "up"
-
-    async def check_redis():
-        if not settings.redis_url:
-            status_map["redis"] = "skipped"
-            return
-        client = redis.from_url(settings.redis_url, decode_responses=True)
-        await client.ping()
-        await client.close()
-        status_map["redis"] = "up"
-
-    async def check_kafka():
-        if not settings.kafka_bootstrap_servers:
-            status_map["kafka"] = "skipped"
-            return
-        producer = AIOKafkaProducer(bootstrap_servers=settings.kafka_bootstrap_servers)
-        await producer.start()
-        await producer.stop()
-        status_map["kafka"] = "up"
-
-    checks = [check_db(), check_redis(), check_kafka()]
-    results = await asyncio.gather(*checks, return_exceptions=True)
-    for result, key in zip(results, ["db", "redis", "kafka"]):
-        if isinstance(result, Exception):
-            status_map[key] = "down"
-
-    overall = "ok" if all(value in ("up", "skipped") for value in status_map.values()) else "degraded"
-    return {"status": overall, "dependencies": status_map}
+
+async def get_carts(db: AsyncSession = Depends(get_db)) -> CartRepository:
+    return get_cart_repository(db)
+
+
+async def load_owned_cart(
+    carts: CartRepository, cart_id: int, user_id: int, with_items: bool = True
+) -> CartOut:
+    cart = await carts.get(cart_id, with_items=with_items)
+    if not cart or cart.user_id != user_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cart not found")
+    return cart
 
 
 @router.post("/carts", response_model=CartOut, status_code=status.HTTP_201_CREATED)
-async def create_cart(request: Request, db: AsyncSession = Depends(get_db)):
-    user_id, _role = require_user(request)
-    existing = (
-        await db.execute(
-            select(Cart).where(Cart.user_id == user_id, Cart.status == "active").limit(1)
-        )
-    ).scalar_one_or_none()
+async def create_cart(request: Request, carts: CartRepository = Depends(get_carts)):
+    user_id, _role = await require_user(request)
+    existing = await carts.get_active_for_user(user_id)
     if existing:
-        items = await fetch_cart_items(db, existing.id)
-        return CartOut.model_validate(existing, update={"items": items})
-
-    expires_at = datetime.utcnow() + timedelta(days=7)
-    cart = Cart(user_id=user_id, status="active", expires_at=expires_at)
-    db.add(cart)
-    await db.commit()
-    await db.refresh(cart)
-    return CartOut.model_validate(cart, update={"items": []})
+        return existing
+    return await carts.create(user_id)
 
 
 @router.get("/carts/{cart_id}", response_model=CartOut)
-async def get_cart(cart_id: int, request: Request, db: AsyncSession = Depends(get_db)):
-    user_id, _role = require_user(request)
-    cart = (await db.execute(select(Cart).where(Cart.id == cart_id))).scalar_one_or_none()
-    if not cart or cart.user_id != user_id:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cart not found")
-    items = await fetch_cart_items(db, cart.id)
-    return CartOut.model_validate(cart, update={"items": items})
+async def get_cart(cart_id: int, request: Request, carts: CartRepository = Depends(get_carts)):
+    user_id, _role = await require_user(request)
+    return await load_owned_cart(carts, cart_id, user_id)
 
 
 @router.post("/carts/{cart_id}/items", response_model=CartItemOut, status_code=status.HTTP_201_CREATED)
 async def add_cart_item(
-    cart_id: int, item_in: CartItemCreate, request: Request, db: AsyncSession = Depends(get_db)
+    cart_id: int, item_in: CartItemCreate, request: Request, carts: CartRepository = Depends(get_carts)
 ):
-    user_id, _role = require_user(request)
-    cart = (await db.execute(select(Cart).where(Cart.id == cart_id))).scalar_one_or_none()
-    if not cart or cart.user_id != user_id:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cart not found")
-
-    item = CartItem(
-        cart_id=cart_id,
-        product_id=item_in.product_id,
-        sku=item_in.sku,
-        qty=item_in.qty,
-        unit_price=item_in.unit_price,
-    )
-    db.add(item)
-    await db.commit()
-    await db.refresh(item)
-    return CartItemOut.model_validate(item)
+    user_id, _role = await require_user(request)
+    cart = await load_owned_cart(carts, cart_id, user_id, with_items=False)
+    return await carts.add_item(cart, item_in)
 
 
 @router.patch("/carts/{cart_id}/items/{item_id}", response_model=CartItemOut)
@@ -152,157 +105,122 @@ async def update_cart_item(
     item_id: int,
     item_in: CartItemUpdate,
     request: Request,
-    db: AsyncSession = Depends(get_db),
+    carts: CartRepository = Depends(get_carts),
 ):
-    user_id, _role = require_user(request)
-    cart = (await db.execute(select(Cart).where(Cart.id == cart_id))).scalar_one_or_none()
-    if not cart or cart.user_id != user_id:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cart not found")
-
-    item = (
-        await db.execute(select(CartItem).where(CartItem.id == item_id, CartItem.cart_id == cart_id))
-    ).scalar_one_or_none()
+    user_id, _role = await require_user(request)
+    cart = await load_owned_cart(carts, cart_id, user_id, with_items=False)
+    item = await carts.update_item(cart, item_id, item_in.qty)
     if not item:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cart item not found")
-
-    item.qty = item_in.qty
-    await db.commit()
-    await db.refresh(item)
-    return CartItemOut.model_validate(item)
+    return item
 
 
 @router.delete("/carts/{cart_id}/items/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_cart_item(
-    cart_id: int, item_id: int, request: Request, db: AsyncSession = Depends(get_db)
+    cart_id: int, item_id: int, request: Request, carts: CartRepository = Depends(get_carts)
 ):
-    user_id, _role = require_user(request)
-    cart = (await db.execute(select(Cart).where(Cart.id == cart_id))).scalar_one_or_none()
-    if not cart or cart.user_id != user_id:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cart not found")
-
-    item = (
-        await db.execute(select(CartItem).where(CartItem.id == item_id, CartItem.cart_id == cart_id))
-    ).scalar_one_or_none()
-    if not item:
+    user_id, _role = await require_user(request)
+    cart = await load_owned_cart(carts, cart_id, user_id, with_items=False)
+    if not await carts.delete_item(cart, item_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cart item not found")
 
-    await db.delete(item)
-    await db.commit()
-
 
 @router.post("/checkouts", response_model=CheckoutOut, status_code=status.HTTP_201_CREATED)
 async def create_checkout(
     checkout_in: CheckoutCreate, request: Request, db: AsyncSession = Depends(get_db)
 ):
-    user_id, _role = require_user(request)
-    cart = (
-        await db.execute(select(Cart).where(Cart.id == checkout_in.cart_id))
-    ).scalar_one_or_none()
-    if not cart or cart.user_id != user_id:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cart not found")
-
+    user_id, _role = await require_user(request)
     idempotency_key = request.headers.get("Idempotency-Key")
-    if idempotency_key:
-        existing = (
-            await db.execute(
-                select(CheckoutSession).where(CheckoutSession.idempotency_key == idempotency_key)
-            )
-        ).scalar_one_or_none()
-        if existing and existing.order_id:
-            order = (
-                await db.execute(select(Order).where(Order.id == existing.order_id))
-            ).scalar_one_or_none()
-            if order:
-                return CheckoutOut(
-                    order_id=order.id, total_amount=order.total_amount, currency=order.currency
-                )
-
-    items = (await db.execute(select(CartItem).where(CartItem.cart_id == cart.id))).scalars().all()
-    if not items:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cart is empty")
-
-    total = await compute_cart_total(db, cart.id)
-    order = Order(user_id=user_id, status="placed", total_amount=total, currency=settings.default_currency)
-    db.add(order)
-    await db.flush()
-
-    for item in items:
-        db.add(
-            OrderItem(
-                order_id=order.id,
-                product_id=item.product_id,
-                sku=item.sku,
-                qty=item.qty,
-                unit_price=item.unit_price,
-            )
+
+    async def run_checkout() -> CheckoutOut:
+        if idempotency_key:
+            existing = await find_idempotent_checkout(db, idempotency_key)
+            if existing:
+                return existing
+
+        carts = get_cart_repository(db)
+        cart = await carts.get_for_checkout(checkout_in.cart_id)
+        if not cart or cart.user_id != user_id:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cart not found")
+        if not cart.items:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cart is empty")
+
+        try:
+            return await place_order(db, carts, cart, user_id, idempotency_key)
+        except IntegrityError:
+            # Another request won the checkout_sessions.idempotency_key race.
+            await db.rollback()
+            existing = await find_idempotent_checkout(db, idempotency_key) if idempotency_key else None
+            if not existing:
+                raise
+            return existing
+
+    store = get_idempotency_store() if idempotency_key else None
+    if store is None:
+        return await run_checkout()
+    try:
+        return await store.run(f"checkout:{user_id}", idempotency_key, CheckoutOut, run_checkout)
+    except IdempotencyInProgress:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Checkout with this key is still in progress"
         )
 
-    totals_json = {
-        "subtotal": str(total),
-        "discount": "0",
-        "shipping": "0",
-        "tax": "0",
-        "total": str(total),
-    }
-    checkout_session = CheckoutSession(
-        cart_id=cart.id,
-        order_id=order.id,
-        idempotency_key=idempotency_key,
-        totals_json=totals_json,
-    )
-    db.add(checkout_session)
-    await db.commit()
-    await db.refresh(order)
-    return CheckoutOut(order_id=order.id, total_amount=order.total_amount, currency=order.currency)
+
+async def load_owned_order(orders: OrderRepository, order_id: int, user_id: int) -> Order:
+    order = await orders.get_owned(order_id, user_id)
+    if not order:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
+    return order
 
 
 @router.get("/orders", response_model=list[OrderOut])
-async def list_orders(request: Request, db: AsyncSession = Depends(get_db)):
-    user_id, _role = require_user(request)
-    orders = (await db.execute(select(Order).where(Order.user_id == user_id))).scalars().all()
-    results: list[OrderOut] = []
-    for order in orders:
-        items = (
-            await db.execute(select(OrderItem).where(OrderItem.order_id == order.id))
-        ).scalars().all()
-        results.append(
-            OrderOut.model_validate(order, update={"items": [OrderItemOut.model_validate(i) for i in items]})
-        )
-    return results
+async def list_orders(
+    request: Request,
+    response: Response,
+    cursor: str | None = None,
+    limit: int = Query(default=20, ge=1, le=100),
+    status_filter: str | None = Query(default=None, alias="status"),
+    db: AsyncSession = Depends(get_db),
+):
+    user_id, _role = await require_user(request)
+    orders = OrderRepository(db)
+    try:
+        page, next_cursor = await orders.list_page(user_id, limit, cursor=cursor, status=status_filter)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return await orders.with_items(page)
 
 
 @router.get("/orders/{order_id}", response_model=OrderOut)
 async def get_order(order_id: int, request: Request, db: AsyncSession = Depends(get_db)):
-    user_id, _role = require_user(request)
-    order = (await db.execute(select(Order).where(Order.id == order_id))).scalar_one_or_none()
-    if not order or order.user_id != user_id:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
-    items = (await db.execute(select(OrderItem).where(OrderItem.order_id == order.id))).scalars().all()
-    return OrderOut.model_validate(order, update={"items": [OrderItemOut.model_validate(i) for i in items]})
+    user_id, _role = await require_user(request)
+    orders = OrderRepository(db)
+    order = await load_owned_order(orders, order_id, user_id)
+    return (await orders.with_items([order]))[0]
 
 
 @router.post("/orders/{order_id}/cancel", response_model=OrderOut)
 async def cancel_order(order_id: int, request: Request, db: AsyncSession = Depends(get_db)):
-    user_id, _role = require_user(request)
-    order = (await db.execute(select(Order).where(Order.id == order_id))).scalar_one_or_none()
-    if not order or order.user_id != user_id:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
+    user_id, _role = await require_user(request)
+    orders = OrderRepository(db)
+    order = await load_owned_order(orders, order_id, user_id)
 
     if order.status in {"paid", "fulfilled", "completed"}:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Order cannot be canceled")
 
     order.status = "canceled"
+    add_order_event(db, "order_canceled", order)
     await db.commit()
-    await db.refresh(order)
-    items = (await db.execute(select(OrderItem).where(OrderItem.order_id == order.id))).scalars().all()
-    return OrderOut.model_validate(order, update={"items": [OrderItemOut.model_validate(i) for i in items]})
+    return (await orders.with_items([order]))[0]
 
 
 @router.post("/promos/validate", response_model=PromoValidateOut)
 async def validate_promo(
     promo_in: PromoValidateIn, request: Request, db: AsyncSession = Depends(get_db)
 ):
-    user_id, _role = require_user(request)
+    user_id, _role = await require_user(request)
     code = promo_in.code.strip().upper()
     promo = (await db.execute(select(Promo).where(Promo.code == code))).scalar_one_or_none()
     if not promo:
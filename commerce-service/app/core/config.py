@@ -16,7 +16,39 @@ class Settings(BaseSettings):
         validation_alias=AliasChoices("COMMERCE_DATABASE_URL"),
     )
     redis_url: str | None = Field(default="redis://redis:6379/0", alias="REDIS_URL")
+    cart_store: str = Field(default="redis", alias="CART_STORE")
+    cart_ttl_days: int = Field(default=7, alias="CART_TTL_DAYS")
+    idempotency_result_ttl_seconds: int = Field(default=86400, alias="IDEMPOTENCY_RESULT_TTL_SECONDS")
+    idempotency_lock_ttl_seconds: int = Field(default=30, alias="IDEMPOTENCY_LOCK_TTL_SECONDS")
+    idempotency_wait_timeout_seconds: float = Field(default=10.0, alias="IDEMPOTENCY_WAIT_TIMEOUT_SECONDS")
+    idempotency_poll_interval_seconds: float = Field(default=0.05, alias="IDEMPOTENCY_POLL_INTERVAL_SECONDS")
     kafka_bootstrap_servers: str | None = Field(default="kafka:9092", alias="KAFKA_BOOTSTRAP_SERVERS")
+    kafka_connect_retry_seconds: float = Field(default=5.0, alias="KAFKA_CONNECT_RETRY_SECONDS")
+    order_events_topic: str = Field(default="order.events", alias="ORDER_EVENTS_TOPIC")
+    outbox_poll_interval_seconds: float = Field(default=5, alias="OUTBOX_POLL_INTERVAL_SECONDS")
+    outbox_min_poll_interval_seconds: float = Field(default=0.05, alias="OUTBOX_MIN_POLL_INTERVAL_SECONDS")
+    outbox_batch_size: int = Field(default=500, alias="OUTBOX_BATCH_SIZE")
+    outbox_linger_ms: int = Field(default=5, alias="OUTBOX_LINGER_MS")
+    outbox_compression_type: str | None = Field(default="gzip", alias="OUTBOX_COMPRESSION_TYPE")
+    payment_events_topic: str = Field(default="payment.events", alias="PAYMENT_EVENTS_TOPIC")
+    payment_events_group_id: str = Field(default="commerce-service", alias="PAYMENT_EVENTS_GROUP_ID")
+    consumer_max_records: int = Field(default=500, alias="CONSUMER_MAX_RECORDS")
+    consumer_poll_timeout_ms: int = Field(default=1000, alias="CONSUMER_POLL_TIMEOUT_MS")
+    consumer_retry_backoff_seconds: float = Field(default=2.0, alias="CONSUMER_RETRY_BACKOFF_SECONDS")
+    consumer_max_attempts: int = Field(default=5, alias="CONSUMER_MAX_ATTEMPTS")
+    # Must exceed the payment.events topic retention, or a replayed event could be applied twice.
+    processed_events_retention_days: int = Field(default=14, alias="PROCESSED_EVENTS_RETENTION_DAYS")
+    retention_interval_seconds: float = Field(default=3600, alias="RETENTION_INTERVAL_SECONDS")
+    retention_chunk_size: int = Field(default=1000, alias="RETENTION_CHUNK_SIZE")
+    health_check_interval_seconds: float = Field(default=5.0, alias="HEALTH_CHECK_INTERVAL_SECONDS")
+    health_check_timeout_seconds: float = Field(default=2.0, alias="HEALTH_CHECK_TIMEOUT_SECONDS")
+    auth_jwks_url: str = Field(
+        default="http://auth-service:8000/.well-known/jwks.json", alias="AUTH_JWKS_URL"
+    )
+    auth_jwt_issuer: str = Field(default="markethub-auth", alias="AUTH_JWT_ISSUER")
+    auth_jwks_refresh_seconds: float = Field(default=300, alias="AUTH_JWKS_REFRESH_SECONDS")
+    auth_jwks_min_refresh_seconds: float = Field(default=30, alias="AUTH_JWKS_MIN_REFRESH_SECONDS")
+    auth_jwks_timeout_seconds: float = Field(default=2.0, alias="AUTH_JWKS_TIMEOUT_SECONDS")
     secret_key: str = Field(default="change-me-in-prod", alias="SECRET_KEY")
     session_cookie_name: str = Field(default="markethub_session", alias="SESSION_COOKIE_NAME")
     session_cookie_same_site: str = Field(default="lax", alias="SESSION_COOKIE_SAMESITE")
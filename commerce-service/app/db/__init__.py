@@ -1 +1 @@
-__all__ = ["base", "models", "session"]
+__all__ = ["base", "models", "redis", "session"]
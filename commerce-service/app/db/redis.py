@@ -0,0 +1,21 @@
+import redis.asyncio as redis
+
+from app.core.config import settings
+
+_client: redis.Redis | None = None
+
+
+def get_redis() -> redis.Redis | None:
+    global _client
+    if not settings.redis_url:
+        return None
+    if _client is None:
+        _client = redis.from_url(settings.redis_url, decode_responses=True)
+    return _client
+
+
+async def close_redis():
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
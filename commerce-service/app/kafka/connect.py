@@ -0,0 +1,30 @@
+import asyncio
+import logging
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+async def start_with_retry(factory, stopping: asyncio.Event, name: str):
+    """Start a client from `factory`, retrying every KAFKA_CONNECT_RETRY_SECONDS.
+
+    Returns the started client, or None if `stopping` is set first. Kafka is not
+    a startup dependency, so an unreachable broker only delays the client.
+    """
+    while not stopping.is_set():
+        client = factory()
+        try:
+            await client.start()
+            return client
+        except Exception:
+            logger.exception("%s could not connect to Kafka; retrying", name)
+            try:
+                await client.stop()
+            except Exception:
+                logger.exception("%s cleanup after failed start failed", name)
+        try:
+            await asyncio.wait_for(stopping.wait(), timeout=settings.kafka_connect_retry_seconds)
+        except asyncio.TimeoutError:
+            continue
+    return None
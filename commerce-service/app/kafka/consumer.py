@@ -0,0 +1,132 @@
+import asyncio
+import json
+import logging
+
+from aiokafka import AIOKafkaConsumer
+from sqlalchemy.exc import InterfaceError, OperationalError
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.kafka.connect import start_with_retry
+from app.services.payment_events import apply_payment_events
+
+logger = logging.getLogger(__name__)
+
+# Failures that say nothing about the message itself; these are retried, never skipped.
+TRANSIENT_ERRORS = (OperationalError, InterfaceError, OSError, asyncio.TimeoutError)
+EVENT_ID_MAX_LENGTH = 64
+
+
+class PaymentEventConsumer:
+    def __init__(self):
+        self._consumer: AIOKafkaConsumer | None = None
+        self._task: asyncio.Task | None = None
+        self._stopping = asyncio.Event()
+        self._failures = 0
+
+    async def start(self):
+        # Connects in the background, so an unreachable broker does not block startup.
+        self._task = asyncio.create_task(self._run())
+
+    def _create_consumer(self) -> AIOKafkaConsumer:
+        return AIOKafkaConsumer(
+            settings.payment_events_topic,
+            bootstrap_servers=settings.kafka_bootstrap_servers,
+            group_id=settings.payment_events_group_id,
+            enable_auto_commit=False,
+            auto_offset_reset="earliest",
+        )
+
+    async def stop(self):
+        self._stopping.set()
+        if self._task:
+            await self._task
+        if self._consumer:
+            await self._consumer.stop()
+
+    async def _run(self):
+        self._consumer = await start_with_retry(
+            self._create_consumer, self._stopping, "Payment events consumer"
+        )
+        while not self._stopping.is_set():
+            try:
+                await self._consume_once()
+                self._failures = 0
+            except Exception:
+                # Broker, decode or DB errors: log, rewind and retry rather than end the task.
+                self._failures += 1
+                logger.exception(
+                    "Failed to consume payment events (attempt %d); rewinding to committed offsets",
+                    self._failures,
+                )
+                try:
+                    await self._consumer.seek_to_committed()
+                except Exception:
+                    logger.exception("Failed to rewind payment events consumer")
+                try:
+                    await asyncio.wait_for(
+                        self._stopping.wait(), timeout=settings.consumer_retry_backoff_seconds
+                    )
+                except asyncio.TimeoutError:
+                    continue
+
+    async def _consume_once(self):
+        batches = await self._consumer.getmany(
+            timeout_ms=settings.consumer_poll_timeout_ms,
+            max_records=settings.consumer_max_records,
+        )
+        messages = [message for records in batches.values() for message in records]
+        if not messages:
+            return
+
+        if self._failures >= settings.consumer_max_attempts:
+            await self._apply_one_by_one(messages)
+        else:
+            await self._apply([self._decode(message) for message in messages])
+        # Offsets only move once the order updates are durable.
+        await self._consumer.commit()
+
+    @staticmethod
+    async def _apply(events: list[dict | None]) -> None:
+        async with AsyncSessionLocal() as session:
+            await apply_payment_events(
+                session, settings.payment_events_topic, [event for event in events if event]
+            )
+
+    async def _apply_one_by_one(self, messages) -> None:
+        """After CONSUMER_MAX_ATTEMPTS failed polls, isolate the poison message and skip it.
+
+        Each message gets its own transaction, in offset order. A message that
+        still fails is logged with its payload and skipped, so it cannot stall
+        the partition; transient DB or network errors are re-raised and retried.
+        """
+        for message in messages:
+            try:
+                await self._apply([self._decode(message)])
+            except TRANSIENT_ERRORS:
+                raise
+            except Exception:
+                logger.exception(
+                    "Skipping payment event %s:%s:%s after %d failed attempts: %r",
+                    message.topic,
+                    message.partition,
+                    message.offset,
+                    self._failures,
+                    message.value,
+                )
+
+    @staticmethod
+    def _decode(message) -> dict | None:
+        try:
+            event = json.loads(message.value)
+        except (TypeError, ValueError):
+            logger.warning("Skipping undecodable payment event at offset %s", message.offset)
+            return None
+        if not isinstance(event, dict):
+            return None
+        # Events without a usable id (pre-id, null or oversized) fall back to their log position.
+        event_id = event.get("event_id")
+        if not event_id or len(str(event_id)) > EVENT_ID_MAX_LENGTH:
+            event_id = f"{message.topic}:{message.partition}:{message.offset}"
+        event["event_id"] = str(event_id)
+        return event
@@ -0,0 +1,109 @@
+import asyncio
+import json
+import logging
+from collections import deque
+
+from aiokafka import AIOKafkaProducer
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.kafka.connect import start_with_retry
+from app.services.outbox import fetch_pending_outbox, mark_outbox_published
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxPublisher:
+    def __init__(self):
+        self._producer: AIOKafkaProducer | None = None
+        self._task: asyncio.Task | None = None
+        self._stopping = asyncio.Event()
+
+    @property
+    def producer(self) -> AIOKafkaProducer | None:
+        return self._producer
+
+    async def start(self):
+        # Connects in the background; `producer` stays None (Kafka "down" in health) until then.
+        self._task = asyncio.create_task(self._run())
+
+    def _create_producer(self) -> AIOKafkaProducer:
+        return AIOKafkaProducer(
+            bootstrap_servers=settings.kafka_bootstrap_servers,
+            linger_ms=settings.outbox_linger_ms,
+            compression_type=settings.outbox_compression_type or None,
+            # Retries must not reorder events that share a partition key.
+            enable_idempotence=True,
+        )
+
+    async def stop(self):
+        self._stopping.set()
+        if self._task:
+            await self._task
+        if self._producer:
+            await self._producer.stop()
+
+    async def _run(self):
+        self._producer = await start_with_retry(self._create_producer, self._stopping, "Outbox publisher")
+        idle_delay = settings.outbox_min_poll_interval_seconds
+        while not self._stopping.is_set():
+            try:
+                published = await self._publish_batch()
+            except Exception:
+                logger.exception("Outbox publish batch failed")
+                published = 0
+
+            if published >= settings.outbox_batch_size:
+                # Backlog remains: go straight back for the next batch.
+                idle_delay = settings.outbox_min_poll_interval_seconds
+                continue
+            if published:
+                idle_delay = settings.outbox_min_poll_interval_seconds
+            else:
+                idle_delay = min(idle_delay * 2, settings.outbox_poll_interval_seconds)
+
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=idle_delay)
+            except asyncio.TimeoutError:
+                continue
+
+    async def _publish_batch(self) -> int:
+        if not self._producer:
+            return 0
+        async with AsyncSessionLocal() as session:
+            events = await fetch_pending_outbox(session, limit=settings.outbox_batch_size)
+            if not events:
+                return 0
+
+            # Events of one key go out one wave at a time, so a failed send stops the key's later
+            # events (they stay pending and retry in order); distinct keys are still pipelined.
+            by_key: dict[str, deque] = {}
+            for event in events:
+                by_key.setdefault(event.partition_key or f"outbox:{event.id}", deque()).append(event)
+
+            published_ids = []
+            while by_key:
+                wave = [(key, queue.popleft()) for key, queue in by_key.items()]
+                results = await asyncio.gather(
+                    *(self._deliver(event) for _key, event in wave), return_exceptions=True
+                )
+                for (key, event), result in zip(wave, results):
+                    if isinstance(result, Exception):
+                        logger.warning("Outbox event %s not published: %s", event.id, result)
+                        by_key.pop(key)
+                    else:
+                        published_ids.append(event.id)
+                        if not by_key[key]:
+                            by_key.pop(key)
+
+            await mark_outbox_published(session, published_ids)
+            await session.commit()
+            return len(published_ids)
+
+    async def _deliver(self, event):
+        delivery = await self._producer.send(
+            event.topic,
+            json.dumps(event.payload).encode("utf-8"),
+            key=event.partition_key.encode("utf-8") if event.partition_key else None,
+        )
+        return await delivery
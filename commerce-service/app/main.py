@@ -4,8 +4,15 @@ from starlette.middleware.sessions import SessionMiddleware
 
 from app.api.routes import router
 from app.core.config import settings
+from app.core.jwks import JWKSVerifier
 from app.db.base import Base
+from app.db.redis import close_redis
 from app.db.session import engine
+from app.kafka.consumer import PaymentEventConsumer
+from app.kafka.publisher import OutboxPublisher
+from app.repositories.cart_repo import init_cart_store
+from app.services.health import HealthMonitor
+from app.services.retention import RetentionJob
 
 app = FastAPI(title=settings.app_name, version="0.1.0")
 
@@ -25,8 +32,33 @@ app.add_middleware(
 
 app.include_router(router, prefix=settings.api_v1_prefix)
 
+publisher = OutboxPublisher()
+payment_events = PaymentEventConsumer()
+retention_job = RetentionJob()
+health_monitor = HealthMonitor(lambda: publisher.producer)
+app.state.health = health_monitor
+jwks = JWKSVerifier()
+app.state.jwks = jwks
+
 
 @app.on_event("startup")
 async def on_startup():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    await init_cart_store()
+    if settings.kafka_bootstrap_servers:
+        await publisher.start()
+        await payment_events.start()
+    await health_monitor.start()
+    await retention_job.start()
+    await jwks.start()
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await jwks.stop()
+    await retention_job.stop()
+    await health_monitor.stop()
+    await payment_events.stop()
+    await publisher.stop()
+    await close_redis()
@@ -0,0 +1 @@
+__all__ = ["cart_repo", "order_repo"]
@@ -0,0 +1,309 @@
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+
+import redis.asyncio as redis
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models import Cart, CartItem
+from app.db.redis import get_redis
+from app.db.session import AsyncSessionLocal
+from app.schemas import CartItemCreate, CartItemOut, CartOut
+
+CART_KEY = "cart:{cart_id}"
+USER_CART_KEY = "cart:user:{user_id}"
+CART_ID_SEQ_KEY = "cart:id_seq"
+CART_ITEM_ID_SEQ_KEY = "cart:item_id_seq"
+ITEM_FIELD_PREFIX = "item:"
+CART_META_FIELDS = ("user_id", "status", "expires_at")
+
+# Cart ids must stay unique across the Redis and MySQL stores because carts are
+# written back to `carts` at checkout, so the Redis sequence never goes below
+# the highest id MySQL has handed out.
+_RAISE_SEQUENCE_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local floor = tonumber(ARGV[1])
+if floor > current then
+    redis.call('SET', KEYS[1], floor)
+    return floor
+end
+return current
+"""
+
+
+def _new_expiry() -> datetime:
+    return datetime.utcnow() + timedelta(days=settings.cart_ttl_days)
+
+
+def _epoch(value: datetime) -> int:
+    return int(value.replace(tzinfo=timezone.utc).timestamp())
+
+
+def _cart_out(cart: Cart, items: list[CartItemOut]) -> CartOut:
+    return CartOut.model_validate(cart).model_copy(update={"items": items})
+
+
+class CartRepository(ABC):
+    @abstractmethod
+    async def get(self, cart_id: int, with_items: bool = True) -> CartOut | None:
+        raise NotImplementedError
+
+    async def get_for_checkout(self, cart_id: int) -> CartOut | None:
+        return await self.get(cart_id)
+
+    @abstractmethod
+    async def get_active_for_user(self, user_id: int) -> CartOut | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def create(self, user_id: int) -> CartOut:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def add_item(self, cart: CartOut, item_in: CartItemCreate) -> CartItemOut:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def update_item(self, cart: CartOut, item_id: int, qty: int) -> CartItemOut | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_item(self, cart: CartOut, item_id: int) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def snapshot(self, db: AsyncSession, cart: CartOut) -> None:
+        raise NotImplementedError
+
+
+class SqlCartRepository(CartRepository):
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _items(self, cart_id: int) -> list[CartItemOut]:
+        items = (await self.db.execute(select(CartItem).where(CartItem.cart_id == cart_id))).scalars().all()
+        return [CartItemOut.model_validate(item) for item in items]
+
+    async def get(self, cart_id: int, with_items: bool = True) -> CartOut | None:
+        cart = (await self.db.execute(select(Cart).where(Cart.id == cart_id))).scalar_one_or_none()
+        if not cart:
+            return None
+        items = await self._items(cart.id) if with_items else []
+        return _cart_out(cart, items)
+
+    async def get_for_checkout(self, cart_id: int) -> CartOut | None:
+        rows = (
+            await self.db.execute(
+                select(Cart, CartItem)
+                .outerjoin(CartItem, CartItem.cart_id == Cart.id)
+                .where(Cart.id == cart_id)
+                .order_by(CartItem.id)
+                .with_for_update()
+            )
+        ).all()
+        if not rows:
+            return None
+        items = [CartItemOut.model_validate(item) for _cart, item in rows if item is not None]
+        return _cart_out(rows[0][0], items)
+
+    async def get_active_for_user(self, user_id: int) -> CartOut | None:
+        cart = (
+            await self.db.execute(
+                select(Cart).where(Cart.user_id == user_id, Cart.status == "active").limit(1)
+            )
+        ).scalar_one_or_none()
+        if not cart:
+            return None
+        return _cart_out(cart, await self._items(cart.id))
+
+    async def create(self, user_id: int) -> CartOut:
+        cart = Cart(user_id=user_id, status="active", expires_at=_new_expiry())
+        self.db.add(cart)
+        await self.db.commit()
+        await self.db.refresh(cart)
+        return _cart_out(cart, [])
+
+    async def add_item(self, cart: CartOut, item_in: CartItemCreate) -> CartItemOut:
+        item = CartItem(
+            cart_id=cart.id,
+            product_id=item_in.product_id,
+            sku=item_in.sku,
+            qty=item_in.qty,
+            unit_price=item_in.unit_price,
+        )
+        self.db.add(item)
+        await self.db.commit()
+        await self.db.refresh(item)
+        return CartItemOut.model_validate(item)
+
+    async def update_item(self, cart: CartOut, item_id: int, qty: int) -> CartItemOut | None:
+        item = (
+            await self.db.execute(
+                select(CartItem).where(CartItem.id == item_id, CartItem.cart_id == cart.id)
+            )
+        ).scalar_one_or_none()
+        if not item:
+            return None
+        item.qty = qty
+        await self.db.commit()
+        await self.db.refresh(item)
+        return CartItemOut.model_validate(item)
+
+    async def delete_item(self, cart: CartOut, item_id: int) -> bool:
+        result = await self.db.execute(
+            delete(CartItem).where(CartItem.id == item_id, CartItem.cart_id == cart.id)
+        )
+        await self.db.commit()
+        return result.rowcount > 0
+
+    async def snapshot(self, db: AsyncSession, cart: CartOut) -> None:
+        # Rows already live in MySQL.
+        return None
+
+
+class RedisCartRepository(CartRepository):
+    """One hash per cart: meta fields plus one `item:<id>` field per line."""
+
+    def __init__(self, client: redis.Redis):
+        self.client = client
+
+    @staticmethod
+    def _key(cart_id: int) -> str:
+        return CART_KEY.format(cart_id=cart_id)
+
+    @staticmethod
+    def _parse(cart_id: int, data: dict[str, str], with_items: bool) -> CartOut:
+        items: list[CartItemOut] = []
+        if with_items:
+            items = sorted(
+                (
+                    CartItemOut.model_validate_json(value)
+                    for field, value in data.items()
+                    if field.startswith(ITEM_FIELD_PREFIX)
+                ),
+                key=lambda item: item.id,
+            )
+        expires_at = data.get("expires_at")
+        return CartOut(
+            id=cart_id,
+            user_id=int(data["user_id"]),
+            status=data["status"],
+            expires_at=datetime.fromisoformat(expires_at) if expires_at else None,
+            items=items,
+        )
+
+    async def get(self, cart_id: int, with_items: bool = True) -> CartOut | None:
+        key = self._key(cart_id)
+        if with_items:
+            data = await self.client.hgetall(key)
+        else:
+            values = await self.client.hmget(key, CART_META_FIELDS)
+            data = {field: value for field, value in zip(CART_META_FIELDS, values) if value is not None}
+        if "user_id" not in data:
+            return None
+        return self._parse(cart_id, data, with_items)
+
+    async def get_active_for_user(self, user_id: int) -> CartOut | None:
+        cart_id = await self.client.get(USER_CART_KEY.format(user_id=user_id))
+        if not cart_id:
+            return None
+        cart = await self.get(int(cart_id))
+        if not cart or cart.status != "active":
+            return None
+        return cart
+
+    async def create(self, user_id: int) -> CartOut:
+        cart_id = await self.client.incr(CART_ID_SEQ_KEY)
+        expires_at = _new_expiry()
+        key = self._key(cart_id)
+        user_key = USER_CART_KEY.format(user_id=user_id)
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.hset(
+                key,
+                mapping={"user_id": user_id, "status": "active", "expires_at": expires_at.isoformat()},
+            )
+            pipe.expireat(key, _epoch(expires_at))
+            pipe.set(user_key, cart_id)
+            pipe.expireat(user_key, _epoch(expires_at))
+            await pipe.execute()
+        return CartOut(id=cart_id, user_id=user_id, status="active", expires_at=expires_at, items=[])
+
+    async def _write_item(self, cart: CartOut, item: CartItemOut) -> None:
+        key = self._key(cart.id)
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.hset(key, f"{ITEM_FIELD_PREFIX}{item.id}", item.model_dump_json())
+            # HSET on a key that expired mid-request would otherwise recreate it without a TTL.
+            if cart.expires_at:
+                pipe.expireat(key, _epoch(cart.expires_at))
+            await pipe.execute()
+
+    async def add_item(self, cart: CartOut, item_in: CartItemCreate) -> CartItemOut:
+        item_id = await self.client.incr(CART_ITEM_ID_SEQ_KEY)
+        item = CartItemOut(
+            id=item_id,
+            product_id=item_in.product_id,
+            sku=item_in.sku,
+            qty=item_in.qty,
+            unit_price=item_in.unit_price,
+        )
+        await self._write_item(cart, item)
+        return item
+
+    async def update_item(self, cart: CartOut, item_id: int, qty: int) -> CartItemOut | None:
+        raw = await self.client.hget(self._key(cart.id), f"{ITEM_FIELD_PREFIX}{item_id}")
+        if not raw:
+            return None
+        item = CartItemOut.model_validate_json(raw).model_copy(update={"qty": qty})
+        await self._write_item(cart, item)
+        return item
+
+    async def delete_item(self, cart: CartOut, item_id: int) -> bool:
+        removed = await self.client.hdel(self._key(cart.id), f"{ITEM_FIELD_PREFIX}{item_id}")
+        return removed > 0
+
+    async def snapshot(self, db: AsyncSession, cart: CartOut) -> None:
+        upsert = mysql_insert(Cart).values(
+            id=cart.id, user_id=cart.user_id, status=cart.status, expires_at=cart.expires_at
+        )
+        await db.execute(
+            upsert.on_duplicate_key_update(status=upsert.inserted.status, expires_at=upsert.inserted.expires_at)
+        )
+        await db.execute(delete(CartItem).where(CartItem.cart_id == cart.id))
+        if cart.items:
+            await db.execute(
+                insert(CartItem).values(
+                    [
+                        {
+                            "cart_id": cart.id,
+                            "product_id": item.product_id,
+                            "sku": item.sku,
+                            "qty": item.qty,
+                            "unit_price": item.unit_price,
+                        }
+                        for item in cart.items
+                    ]
+                )
+            )
+
+    async def raise_id_floor(self, floor: int) -> int:
+        return int(await self.client.eval(_RAISE_SEQUENCE_SCRIPT, 1, CART_ID_SEQ_KEY, floor))
+
+
+def use_redis_carts() -> bool:
+    return settings.cart_store == "redis" and get_redis() is not None
+
+
+def get_cart_repository(db: AsyncSession) -> CartRepository:
+    if use_redis_carts():
+        return RedisCartRepository(get_redis())
+    return SqlCartRepository(db)
+
+
+async def init_cart_store():
+    if not use_redis_carts():
+        return
+    async with AsyncSessionLocal() as session:
+        max_id = (await session.execute(select(func.max(Cart.id)))).scalar()
+    await RedisCartRepository(get_redis()).raise_id_floor(max_id or 0)
@@ -0,0 +1,74 @@
+import base64
+from datetime import datetime
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Order, OrderItem
+from app.schemas import OrderItemOut, OrderOut
+
+
+def encode_cursor(order: Order) -> str:
+    raw = f"{order.created_at.isoformat()}|{order.id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, order_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), int(order_id)
+    except (ValueError, UnicodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+class OrderRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_owned(self, order_id: int, user_id: int) -> Order | None:
+        order = (await self.db.execute(select(Order).where(Order.id == order_id))).scalar_one_or_none()
+        if not order or order.user_id != user_id:
+            return None
+        return order
+
+    async def list_page(
+        self,
+        user_id: int,
+        limit: int,
+        cursor: str | None = None,
+        status: str | None = None,
+    ) -> tuple[list[Order], str | None]:
+        stmt = select(Order).where(Order.user_id == user_id)
+        if status:
+            stmt = stmt.where(Order.status == status)
+        if cursor:
+            created_at, order_id = decode_cursor(cursor)
+            stmt = stmt.where(
+                or_(
+                    Order.created_at < created_at,
+                    and_(Order.created_at == created_at, Order.id < order_id),
+                )
+            )
+        stmt = stmt.order_by(Order.created_at.desc(), Order.id.desc()).limit(limit + 1)
+        orders = list((await self.db.execute(stmt)).scalars().all())
+        next_cursor = encode_cursor(orders[limit - 1]) if len(orders) > limit else None
+        return orders[:limit], next_cursor
+
+    async def with_items(self, orders: list[Order]) -> list[OrderOut]:
+        if not orders:
+            return []
+        items_by_order: dict[int, list[OrderItemOut]] = {order.id: [] for order in orders}
+        items = (
+            await self.db.execute(
+                select(OrderItem)
+                .where(OrderItem.order_id.in_(items_by_order.keys()))
+                .order_by(OrderItem.order_id, OrderItem.id)
+            )
+        ).scalars().all()
+        for item in items:
+            items_by_order[item.order_id].append(OrderItemOut.model_validate(item))
+        return [
+            OrderOut.model_validate(order).model_copy(update={"items": items_by_order[order.id]})
+            for order in orders
+        ]
@@ -0,0 +1 @@
+__all__ = ["checkout", "idempotency", "outbox", "payment_events"]
@@ -0,0 +1,96 @@
+from dataclasses import dataclass
+from decimal import Decimal
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models import CheckoutSession, Order, OrderItem
+from app.repositories.cart_repo import CartRepository
+from app.services.outbox import add_order_event
+from app.schemas import CartItemOut, CartOut, CheckoutOut
+
+
+@dataclass
+class CheckoutTotals:
+    subtotal: Decimal
+    discount: Decimal = Decimal("0")
+    shipping: Decimal = Decimal("0")
+    tax: Decimal = Decimal("0")
+
+    @property
+    def total(self) -> Decimal:
+        return self.subtotal - self.discount + self.shipping + self.tax
+
+    def as_json(self) -> dict[str, str]:
+        return {
+            "subtotal": str(self.subtotal),
+            "discount": str(self.discount),
+            "shipping": str(self.shipping),
+            "tax": str(self.tax),
+            "total": str(self.total),
+        }
+
+
+def compute_totals(items: list[CartItemOut]) -> CheckoutTotals:
+    subtotal = sum((item.unit_price * item.qty for item in items), Decimal("0"))
+    return CheckoutTotals(subtotal=subtotal)
+
+
+async def find_idempotent_checkout(db: AsyncSession, idempotency_key: str) -> CheckoutOut | None:
+    order = (
+        await db.execute(
+            select(Order)
+            .join(CheckoutSession, CheckoutSession.order_id == Order.id)
+            .where(CheckoutSession.idempotency_key == idempotency_key)
+        )
+    ).scalar_one_or_none()
+    if not order:
+        return None
+    return CheckoutOut(order_id=order.id, total_amount=order.total_amount, currency=order.currency)
+
+
+async def place_order(
+    db: AsyncSession,
+    carts: CartRepository,
+    cart: CartOut,
+    user_id: int,
+    idempotency_key: str | None = None,
+) -> CheckoutOut:
+    totals = compute_totals(cart.items)
+    await carts.snapshot(db, cart)
+
+    order = Order(
+        user_id=user_id,
+        status="placed",
+        total_amount=totals.total,
+        currency=settings.default_currency,
+    )
+    db.add(order)
+    await db.flush()
+
+    await db.execute(
+        insert(OrderItem).values(
+            [
+                {
+                    "order_id": order.id,
+                    "product_id": item.product_id,
+                    "sku": item.sku,
+                    "qty": item.qty,
+                    "unit_price": item.unit_price,
+                }
+                for item in cart.items
+            ]
+        )
+    )
+    add_order_event(db, "order_created", order, cart.items)
+    db.add(
+        CheckoutSession(
+            cart_id=cart.id,
+            order_id=order.id,
+            idempotency_key=idempotency_key,
+            totals_json=totals.as_json(),
+        )
+    )
+    await db.commit()
+    return CheckoutOut(order_id=order.id, total_amount=totals.total, currency=order.currency)
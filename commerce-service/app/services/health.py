@@ -0,0 +1,106 @@
+import asyncio
+import logging
+import time
+
+from aiokafka import AIOKafkaProducer
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.redis import get_redis
+from app.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+
+class HealthMonitor:
+    """Probes dependencies in the background so health endpoints only read a snapshot."""
+
+    def __init__(self, producer_getter):
+        self._producer_getter = producer_getter
+        self._task: asyncio.Task | None = None
+        self._stopping = asyncio.Event()
+        self.dependencies: dict[str, str] = {"db": "unknown", "redis": "unknown", "kafka": "unknown"}
+        self.checked_at: float | None = None
+
+    @property
+    def status(self) -> str:
+        return "ok" if all(value in ("up", "skipped") for value in self.dependencies.values()) else "degraded"
+
+    @property
+    def ready(self) -> bool:
+        """Serving needs the DB, and Redis when it holds carts; Kafka only delays outbox delivery."""
+        required = ["db"]
+        if settings.cart_store == "redis":
+            required.append("redis")
+        return all(self.dependencies[name] in ("up", "skipped") for name in required)
+
+    def snapshot(self) -> dict:
+        age = None if self.checked_at is None else round(time.monotonic() - self.checked_at, 3)
+        return {
+            "status": self.status,
+            "ready": self.ready,
+            "dependencies": dict(self.dependencies),
+            "age_seconds": age,
+        }
+
+    async def start(self):
+        await self.refresh()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._stopping.set()
+        if self._task:
+            await self._task
+
+    async def refresh(self):
+        checks = {"db": self._check_db, "redis": self._check_redis, "kafka": self._check_kafka}
+        results = await asyncio.gather(
+            *(
+                asyncio.wait_for(check(), timeout=settings.health_check_timeout_seconds)
+                for check in checks.values()
+            ),
+            return_exceptions=True,
+        )
+        self.dependencies = {
+            name: "down" if isinstance(result, BaseException) else result
+            for name, result in zip(checks, results)
+        }
+        self.checked_at = time.monotonic()
+
+    async def _run(self):
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(
+                    self._stopping.wait(), timeout=settings.health_check_interval_seconds
+                )
+            except asyncio.TimeoutError:
+                pass
+            if self._stopping.is_set():
+                break
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Health refresh failed")
+
+    async def _check_db(self) -> str:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        return "up"
+
+    async def _check_redis(self) -> str:
+        client = get_redis()
+        if client is None:
+            return "skipped"
+        await client.ping()
+        return "up"
+
+    async def _check_kafka(self) -> str:
+        if not settings.kafka_bootstrap_servers:
+            return "skipped"
+        producer: AIOKafkaProducer | None = self._producer_getter()
+        if producer is None:
+            return "down"
+        # Reuses the publisher's open broker connections instead of bootstrapping a client.
+        if not await producer.client.force_metadata_update():
+            return "down"
+        return "up"
@@ -0,0 +1,108 @@
+import asyncio
+from typing import Awaitable, Callable, TypeVar
+
+import redis.asyncio as redis
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.db.redis import get_redis
+
+IDEMPOTENCY_KEY = "idem:{scope}:{key}"
+PENDING = "__pending__"
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class IdempotencyInProgress(Exception):
+    pass
+
+
+class IdempotencyStore:
+    """Reserves keys with SET NX and caches the finished response.
+
+    Duplicates in the same process share the first request's future; duplicates
+    on other replicas poll the reservation until the owner stores its result.
+    """
+
+    def __init__(self, client: redis.Redis):
+        self.client = client
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    async def run(
+        self,
+        scope: str,
+        key: str,
+        model: type[ModelT],
+        work: Callable[[], Awaitable[ModelT]],
+    ) -> ModelT:
+        redis_key = IDEMPOTENCY_KEY.format(scope=scope, key=key)
+        inflight = self._inflight.get(redis_key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[redis_key] = future
+        try:
+            result = await self._run_once(redis_key, model, work)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Mark the exception as retrieved when no duplicate is waiting on it.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(redis_key, None)
+
+    async def _run_once(
+        self, redis_key: str, model: type[ModelT], work: Callable[[], Awaitable[ModelT]]
+    ) -> ModelT:
+        while True:
+            reserved = await self.client.set(
+                redis_key, PENDING, nx=True, ex=settings.idempotency_lock_ttl_seconds
+            )
+            if reserved:
+                break
+            cached = await self._wait_for_result(redis_key, model)
+            if cached is not None:
+                return cached
+            # The owner failed and released the key; try to take it over.
+
+        try:
+            result = await work()
+        except BaseException:
+            await self.client.delete(redis_key)
+            raise
+        await self.client.set(
+            redis_key, result.model_dump_json(), ex=settings.idempotency_result_ttl_seconds
+        )
+        return result
+
+    async def _wait_for_result(self, redis_key: str, model: type[ModelT]) -> ModelT | None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.idempotency_wait_timeout_seconds
+        while loop.time() < deadline:
+            value = await self.client.get(redis_key)
+            if value is None:
+                return None
+            if value != PENDING:
+                return model.model_validate_json(value)
+            await asyncio.sleep(settings.idempotency_poll_interval_seconds)
+        raise IdempotencyInProgress(redis_key)
+
+
+_store: IdempotencyStore | None = None
+
+
+def get_idempotency_store() -> IdempotencyStore | None:
+    global _store
+    client = get_redis()
+    if client is None:
+        return None
+    if _store is None or _store.client is not client:
+        _store = IdempotencyStore(client)
+    return _store
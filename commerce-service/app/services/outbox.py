@@ -0,0 +1,92 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models import Order, OutboxEvent
+
+
+def create_outbox_event(session: AsyncSession, topic: str, payload: dict, key: str | None = None) -> OutboxEvent:
+    # Flushed with the caller's transaction so the event commits with the order change.
+    payload = {"event_id": uuid.uuid4().hex, **payload}
+    event = OutboxEvent(topic=topic, partition_key=key, payload=payload, status="pending")
+    session.add(event)
+    return event
+
+
+def order_event_payload(event_type: str, order: Order, items: list | None = None) -> dict:
+    payload = {
+        "event_type": event_type,
+        "order_id": order.id,
+        "user_id": order.user_id,
+        "status": order.status,
+        "total_amount": str(order.total_amount),
+        "currency": order.currency,
+    }
+    if items is not None:
+        payload["items"] = [
+            {
+                "product_id": item.product_id,
+                "sku": item.sku,
+                "qty": item.qty,
+                "unit_price": str(item.unit_price),
+            }
+            for item in items
+        ]
+    return payload
+
+
+def add_order_event(session: AsyncSession, event_type: str, order: Order, items: list | None = None):
+    return create_outbox_event(
+        session,
+        topic=settings.order_events_topic,
+        payload=order_event_payload(event_type, order, items),
+        key=str(order.id),
+    )
+
+
+async def fetch_pending_outbox(session: AsyncSession, limit: int = 50):
+    """Claim pending events for this worker until the session's transaction ends.
+
+    Rows locked by other replicas are skipped; per key only the worker holding
+    the oldest pending event publishes, so events for one order stay ordered.
+    """
+    stmt = (
+        select(OutboxEvent)
+        .where(OutboxEvent.status == "pending")
+        .order_by(OutboxEvent.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    claimed = list((await session.execute(stmt)).scalars())
+    keys = {event.partition_key for event in claimed if event.partition_key}
+    if not keys:
+        return claimed
+
+    oldest_pending = dict(
+        (
+            await session.execute(
+                select(OutboxEvent.partition_key, func.min(OutboxEvent.id))
+                .where(OutboxEvent.status == "pending", OutboxEvent.partition_key.in_(keys))
+                .group_by(OutboxEvent.partition_key)
+            )
+        ).all()
+    )
+    claimed_ids = {event.id for event in claimed}
+    return [
+        event
+        for event in claimed
+        if not event.partition_key or oldest_pending.get(event.partition_key) in claimed_ids
+    ]
+
+
+async def mark_outbox_published(session: AsyncSession, event_ids: list[int]):
+    if not event_ids:
+        return
+    await session.execute(
+        update(OutboxEvent)
+        .where(OutboxEvent.id.in_(event_ids))
+        .values(status="published", published_at=datetime.utcnow())
+    )
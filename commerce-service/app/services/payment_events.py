@@ -0,0 +1,83 @@
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Order, ProcessedEvent
+from app.services.outbox import add_order_event
+
+# target order status -> statuses it may be reached from
+ORDER_TRANSITIONS = {
+    "paid": {"placed"},
+    "refunded": {"paid"},
+}
+ORDER_EVENT_TYPES = {
+    "paid": "order_paid",
+    "refunded": "order_refunded",
+}
+
+
+def target_order_status(event: dict) -> str | None:
+    event_type = event.get("event_type")
+    if event_type == "payment_status_updated" and event.get("status") == "paid":
+        return "paid"
+    if event_type == "payment_refunded":
+        return "refunded"
+    return None
+
+
+def _order_id(event: dict) -> int | None:
+    try:
+        return int(event["order_id"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+async def apply_payment_events(session: AsyncSession, topic: str, events: list[dict]) -> int:
+    """Apply one poll's worth of payment events in a single transaction.
+
+    Every event must carry an `event_id`; ids already in `processed_events` are
+    skipped so redelivered messages are no-ops. Returns the number of orders
+    whose status changed.
+    """
+    unique: dict[str, dict] = {}
+    for event in events:
+        unique.setdefault(event["event_id"], event)
+    if not unique:
+        return 0
+
+    seen = set(
+        (
+            await session.execute(
+                select(ProcessedEvent.event_id).where(ProcessedEvent.event_id.in_(unique.keys()))
+            )
+        ).scalars()
+    )
+    fresh = [event for event_id, event in unique.items() if event_id not in seen]
+    if not fresh:
+        return 0
+
+    await session.execute(
+        insert(ProcessedEvent).values([{"event_id": event["event_id"], "topic": topic} for event in fresh])
+    )
+
+    order_ids = {order_id for event in fresh if (order_id := _order_id(event)) is not None}
+    orders: dict[int, Order] = {}
+    if order_ids:
+        orders = {
+            order.id: order
+            for order in (
+                await session.execute(select(Order).where(Order.id.in_(order_ids)).with_for_update())
+            ).scalars()
+        }
+
+    changed = 0
+    for event in fresh:
+        target = target_order_status(event)
+        order = orders.get(_order_id(event))
+        if not target or not order or order.status not in ORDER_TRANSITIONS[target]:
+            continue
+        order.status = target
+        add_order_event(session, ORDER_EVENT_TYPES[target], order)
+        changed += 1
+
+    await session.commit()
+    return changed
@@ -0,0 +1,68 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, select
+
+from app.core.config import settings
+from app.db.models import ProcessedEvent
+from app.db.session import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+async def purge_processed_events() -> int:
+    """Delete dedupe rows older than PROCESSED_EVENTS_RETENTION_DAYS, RETENTION_CHUNK_SIZE at a time."""
+    cutoff = datetime.utcnow() - timedelta(days=settings.processed_events_retention_days)
+    deleted = 0
+    while True:
+        # One short transaction per chunk keeps row locks brief.
+        async with AsyncSessionLocal() as session:
+            ids = list(
+                (
+                    await session.execute(
+                        select(ProcessedEvent.event_id)
+                        .where(ProcessedEvent.processed_at < cutoff)
+                        .order_by(ProcessedEvent.processed_at)
+                        .limit(settings.retention_chunk_size)
+                    )
+                ).scalars()
+            )
+            if not ids:
+                break
+            await session.execute(
+                delete(ProcessedEvent)
+                .where(ProcessedEvent.event_id.in_(ids))
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+        deleted += len(ids)
+        if len(ids) < settings.retention_chunk_size:
+            break
+    return deleted
+
+
+class RetentionJob:
+    def __init__(self):
+        self._task: asyncio.Task | None = None
+        self._stopping = asyncio.Event()
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._stopping.set()
+        if self._task:
+            await self._task
+
+    async def _run(self):
+        while not self._stopping.is_set():
+            try:
+                deleted = await purge_processed_events()
+                logger.info("Purged %d processed_events rows", deleted)
+            except Exception:
+                logger.exception("processed_events retention failed")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=settings.retention_interval_seconds)
+            except asyncio.TimeoutError:
+                continue
@@ -0,0 +1,85 @@
+"""Checkout pipeline benchmark.
+
+Run from the commerce-service directory against a disposable database:
+
+    COMMERCE_DATABASE_URL=mysql+asyncmy://... python -m scripts.bench_checkout --runs 200
+
+Reports SQL statements per checkout and p50/p99 latency for carts of 1, 20 and
+200 lines using the MySQL cart store.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from decimal import Decimal
+
+from sqlalchemy import event
+
+from app.db.base import Base
+from app.db.models import Cart, CartItem
+from app.db.session import AsyncSessionLocal, engine
+from app.repositories.cart_repo import SqlCartRepository
+from app.services.checkout import place_order
+
+BENCH_USER_ID = 999_999
+
+
+async def seed_cart(lines: int) -> int:
+    async with AsyncSessionLocal() as session:
+        cart = Cart(user_id=BENCH_USER_ID, status="active")
+        session.add(cart)
+        await session.flush()
+        session.add_all(
+            [
+                CartItem(cart_id=cart.id, product_id=n + 1, qty=1, unit_price=Decimal("10.00"))
+                for n in range(lines)
+            ]
+        )
+        await session.commit()
+        return cart.id
+
+
+async def bench(lines: int, runs: int) -> dict[str, float]:
+    statements = 0
+
+    def count(*_args):
+        nonlocal statements
+        statements += 1
+
+    cart_id = await seed_cart(lines)
+    latencies: list[float] = []
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        for _ in range(runs):
+            started = time.perf_counter()
+            async with AsyncSessionLocal() as session:
+                carts = SqlCartRepository(session)
+                cart = await carts.get_for_checkout(cart_id)
+                await place_order(session, carts, cart, BENCH_USER_ID)
+            latencies.append((time.perf_counter() - started) * 1000)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    latencies.sort()
+    return {
+        "queries": statements / runs,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+    }
+
+
+async def main(runs: int):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    print(f"{'lines':>6} {'queries':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    for lines in (1, 20, 200):
+        result = await bench(lines, runs)
+        print(f"{lines:>6} {result['queries']:>8.1f} {result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(main(args.runs))
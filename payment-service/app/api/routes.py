@@ -3,12 +3,14 @@ import hmac
 
 import msgspec
 from starlette.requests import Request
-from starlette.responses import JSONResponse, Response
+from starlette.responses import JSONResponse, PlainTextResponse, Response
 from starlette.routing import Route, Router
 
 from app.api.errors import problem_detail
 from app.core.config import settings
+from app.core.jwks import TokenInvalid
 from app.db.session import SessionLocal
+from app.services.retention import render_metrics
 from app.schemas import (
     CreatePaymentRequest,
     PaymentResponse,
@@ -20,6 +22,7 @@ from app.services.payment import (
     apply_webhook,
     create_payment,
     get_payment_by_id,
+    mark_webhook_processed,
     record_webhook,
     refund_payment,
 )
@@ -40,7 +43,23 @@ def _verify_signature(body: bytes, signature: str | None):
     return hmac.compare_digest(digest, signature)
 
 
+async def _authenticate(request: Request):
+    """Verify a Bearer token locally; returns an error response, or None to continue."""
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        if settings.auth_required:
+            return problem_detail(401, "Unauthorized", "Bearer token required", code="UNAUTHORIZED")
+        return None
+    try:
+        request.state.claims = await request.app.state.jwks.verify(token)
+    except TokenInvalid as exc:
+        return problem_detail(401, "Unauthorized", str(exc), code="UNAUTHORIZED")
+    return None
+
+
 async def create_payment_handler(request: Request):
+    if error := await _authenticate(request):
+        return error
     body = await request.body()
     try:
         payload = _decode_json(body, CreatePaymentRequest)
@@ -72,6 +91,8 @@ async def create_payment_handler(request: Request):
 
 
 async def get_payment_handler(request: Request):
+    if error := await _authenticate(request):
+        return error
     payment_id = request.path_params["payment_id"]
     async with SessionLocal() as session:
         payment = await get_payment_by_id(session, int(payment_id))
@@ -92,6 +113,8 @@ async def get_payment_handler(request: Request):
 
 
 async def refund_payment_handler(request: Request):
+    if error := await _authenticate(request):
+        return error
     payment_id = request.path_params["payment_id"]
     body = await request.body()
     try:
@@ -144,8 +167,9 @@ async def webhook_handler(request: Request):
 
     async with SessionLocal() as session:
         try:
-            await record_webhook(session, "payos", event_id, payload)
+            webhook = await record_webhook(session, "payos", event_id, payload)
             await apply_webhook(session, payload)
+            await mark_webhook_processed(session, webhook)
             await session.commit()
         except Exception:
             await session.rollback()
@@ -158,6 +182,13 @@ async def health_handler(request: Request):
     return JSONResponse({"status": "ok"})
 
 
+async def metrics_handler(request: Request):
+    job = getattr(request.app.state, "compaction_job", None)
+    if job is None:
+        return PlainTextResponse("")
+    return PlainTextResponse(render_metrics(job.report), media_type="text/plain; version=0.0.4")
+
+
 router = Router(
     routes=[
         Route(f"{settings.api_v1_prefix}/payments", create_payment_handler, methods=["POST"]),
@@ -169,5 +200,6 @@ router = Router(
         ),
         Route(f"{settings.api_v1_prefix}/webhooks/payos", webhook_handler, methods=["POST"]),
         Route(f"{settings.api_v1_prefix}/health", health_handler, methods=["GET"]),
+        Route(f"{settings.api_v1_prefix}/metrics", metrics_handler, methods=["GET"]),
     ]
 )
@@ -23,9 +23,43 @@ class Settings(BaseSettings):
     payos_webhook_secret: str = Field(
         default="change-me", validation_alias=AliasChoices("PAYOS_WEBHOOK_SECRET")
     )
-    outbox_poll_interval_seconds: int = Field(
+    outbox_poll_interval_seconds: float = Field(
         default=5, validation_alias=AliasChoices("OUTBOX_POLL_INTERVAL_SECONDS")
     )
+    outbox_min_poll_interval_seconds: float = Field(
+        default=0.05, validation_alias=AliasChoices("OUTBOX_MIN_POLL_INTERVAL_SECONDS")
+    )
+    outbox_batch_size: int = Field(default=500, validation_alias=AliasChoices("OUTBOX_BATCH_SIZE"))
+    outbox_linger_ms: int = Field(default=5, validation_alias=AliasChoices("OUTBOX_LINGER_MS"))
+    outbox_compression_type: str | None = Field(
+        default="gzip", validation_alias=AliasChoices("OUTBOX_COMPRESSION_TYPE")
+    )
+    auth_jwks_url: str = Field(
+        default="http://auth-service:8000/.well-known/jwks.json",
+        validation_alias=AliasChoices("AUTH_JWKS_URL"),
+    )
+    auth_jwt_issuer: str = Field(default="markethub-auth", validation_alias=AliasChoices("AUTH_JWT_ISSUER"))
+    auth_jwks_refresh_seconds: float = Field(
+        default=300, validation_alias=AliasChoices("AUTH_JWKS_REFRESH_SECONDS")
+    )
+    auth_jwks_min_refresh_seconds: float = Field(
+        default=30, validation_alias=AliasChoices("AUTH_JWKS_MIN_REFRESH_SECONDS")
+    )
+    auth_jwks_timeout_seconds: float = Field(
+        default=2.0, validation_alias=AliasChoices("AUTH_JWKS_TIMEOUT_SECONDS")
+    )
+    # Off: Bearer tokens are verified when sent. On: payment endpoints reject requests without one.
+    auth_required: bool = Field(default=False, validation_alias=AliasChoices("AUTH_REQUIRED"))
+    retention_enabled: bool = Field(default=True, validation_alias=AliasChoices("RETENTION_ENABLED"))
+    retention_interval_seconds: float = Field(
+        default=3600, validation_alias=AliasChoices("RETENTION_INTERVAL_SECONDS")
+    )
+    retention_chunk_size: int = Field(default=1000, validation_alias=AliasChoices("RETENTION_CHUNK_SIZE"))
+    outbox_retention_days: int = Field(default=7, validation_alias=AliasChoices("OUTBOX_RETENTION_DAYS"))
+    webhook_retention_days: int = Field(default=30, validation_alias=AliasChoices("WEBHOOK_RETENTION_DAYS"))
+    retention_archive_dir: str | None = Field(
+        default=None, validation_alias=AliasChoices("RETENTION_ARCHIVE_DIR")
+    )
 
 
 settings = Settings()
@@ -0,0 +1,103 @@
+# Kept identical in commerce-service and payment-service (separate build contexts).
+import asyncio
+import json
+import logging
+import time
+import urllib.request
+
+from jose import JWTError, jwt
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TokenInvalid(Exception):
+    pass
+
+
+class JWKSVerifier:
+    """Verifies auth-service access tokens locally against its published JWKS.
+
+    Keys are held in process and refreshed in the background every
+    AUTH_JWKS_REFRESH_SECONDS. A token signed by a key we have not seen yet
+    triggers one early refresh, at most every AUTH_JWKS_MIN_REFRESH_SECONDS.
+    """
+
+    def __init__(self):
+        self.keys: dict[str, dict] = {}
+        self.fetched_at: float | None = None
+        self._attempted_at: float | None = None
+        self._task: asyncio.Task | None = None
+        self._stopping = asyncio.Event()
+        self._refresh_lock = asyncio.Lock()
+
+    async def start(self):
+        try:
+            await self.refresh()
+        except Exception:
+            # Auth may still be starting; unknown kids retry the fetch.
+            logger.exception("Initial JWKS fetch failed")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._stopping.set()
+        if self._task:
+            await self._task
+
+    async def refresh(self):
+        self._attempted_at = time.monotonic()
+        document = await asyncio.to_thread(self._fetch)
+        self.keys = {key["kid"]: key for key in document.get("keys", []) if key.get("kid") and key.get("alg")}
+        self.fetched_at = time.monotonic()
+
+    def _fetch(self) -> dict:
+        request = urllib.request.Request(settings.auth_jwks_url, headers={"Accept": "application/json"})
+        with urllib.request.urlopen(request, timeout=settings.auth_jwks_timeout_seconds) as response:
+            return json.load(response)
+
+    async def _run(self):
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=settings.auth_jwks_refresh_seconds)
+            except asyncio.TimeoutError:
+                pass
+            if self._stopping.is_set():
+                break
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("JWKS refresh failed")
+
+    async def _refresh_unknown_kid(self):
+        async with self._refresh_lock:
+            # Counted from the last attempt, failed or not, so an auth outage does not
+            # turn every unknown-kid token into a blocking fetch.
+            since = None if self._attempted_at is None else time.monotonic() - self._attempted_at
+            if since is not None and since < settings.auth_jwks_min_refresh_seconds:
+                return
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("JWKS refresh failed")
+
+    async def verify(self, token: str) -> dict:
+        """Return the token's claims, or raise TokenInvalid."""
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+        except JWTError as exc:
+            raise TokenInvalid(str(exc)) from exc
+        key = self.keys.get(kid)
+        if key is None:
+            await self._refresh_unknown_kid()
+            key = self.keys.get(kid)
+            if key is None:
+                raise TokenInvalid(f"Unknown signing key {kid!r}")
+        try:
+            # Pinning the algorithm to the key's own stops alg substitution.
+            claims = jwt.decode(token, key, algorithms=[key["alg"]], issuer=settings.auth_jwt_issuer)
+        except JWTError as exc:
+            raise TokenInvalid(str(exc)) from exc
+        if not claims.get("sub"):
+            raise TokenInvalid("Token has no subject")
+        return claims
@@ -1,11 +1,16 @@
 import asyncio
 import json
+import logging
+from collections import deque
+
 from aiokafka import AIOKafkaProducer
 
 from app.core.config import settings
 from app.db.session import SessionLocal
 from app.services.outbox import fetch_pending_outbox, mark_outbox_published
 
+logger = logging.getLogger(__name__)
+
 
 class OutboxPublisher:
     def __init__(self):
@@ -14,7 +19,13 @@ class OutboxPublisher:
         self._stopping = asyncio.Event()
 
     async def start(self):
-        self._producer = AIOKafkaProducer(bootstrap_servers=settings.kafka_bootstrap_servers)
+        self._producer = AIOKafkaProducer(
+            bootstrap_servers=settings.kafka_bootstrap_servers,
+            linger_ms=settings.outbox_linger_ms,
+            compression_type=settings.outbox_compression_type or None,
+            # Retries must not reorder events that share a partition key.
+            enable_idempotence=True,
+        )
         await self._producer.start()
         self._task = asyncio.create_task(self._run())
 
@@ -26,20 +37,65 @@ class OutboxPublisher:
             await self._producer.stop()
 
     async def _run(self):
+        idle_delay = settings.outbox_min_poll_interval_seconds
         while not self._stopping.is_set():
-            async with SessionLocal() as session:
-                events = await fetch_pending_outbox(session)
-                for event in events:
-                    await self._publish_event(event)
-                    await mark_outbox_published(session, event)
-                await session.commit()
             try:
-                await asyncio.wait_for(self._stopping.wait(), timeout=settings.outbox_poll_interval_seconds)
+                published = await self._publish_batch()
+            except Exception:
+                logger.exception("Outbox publish batch failed")
+                published = 0
+
+            if published >= settings.outbox_batch_size:
+                # Backlog remains: go straight back for the next batch.
+                idle_delay = settings.outbox_min_poll_interval_seconds
+                continue
+            if published:
+                idle_delay = settings.outbox_min_poll_interval_seconds
+            else:
+                idle_delay = min(idle_delay * 2, settings.outbox_poll_interval_seconds)
+
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=idle_delay)
             except asyncio.TimeoutError:
                 continue
 
-    async def _publish_event(self, event):
+    async def _publish_batch(self) -> int:
         if not self._producer:
-            return
-        payload = json.dumps(event.payload).encode("utf-8")
-        await self._producer.send_and_wait(event.topic, payload)
+            return 0
+        async with SessionLocal() as session:
+            events = await fetch_pending_outbox(session, limit=settings.outbox_batch_size)
+            if not events:
+                return 0
+
+            # Events of one key go out one wave at a time, so a failed send stops the key's later
+            # events (they stay pending and retry in order); distinct keys are still pipelined.
+            by_key: dict[str, deque] = {}
+            for event in events:
+                by_key.setdefault(event.partition_key or f"outbox:{event.id}", deque()).append(event)
+
+            published_ids = []
+            while by_key:
+                wave = [(key, queue.popleft()) for key, queue in by_key.items()]
+                results = await asyncio.gather(
+                    *(self._deliver(event) for _key, event in wave), return_exceptions=True
+                )
+                for (key, event), result in zip(wave, results):
+                    if isinstance(result, Exception):
+                        logger.warning("Outbox event %s not published: %s", event.id, result)
+                        by_key.pop(key)
+                    else:
+                        published_ids.append(event.id)
+                        if not by_key[key]:
+                            by_key.pop(key)
+
+            await mark_outbox_published(session, published_ids)
+            await session.commit()
+            return len(published_ids)
+
+    async def _deliver(self, event):
+        delivery = await self._producer.send(
+            event.topic,
+            json.dumps(event.payload).encode("utf-8"),
+            key=event.partition_key.encode("utf-8") if event.partition_key else None,
+        )
+        return await delivery
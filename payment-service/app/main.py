@@ -1,13 +1,20 @@
 from starlette.applications import Starlette
 
 from app.api.routes import router
+from app.core.config import settings
+from app.core.jwks import JWKSVerifier
 from app.db.base import Base
 from app.db.session import engine
 from app.kafka.publisher import OutboxPublisher
+from app.services.retention import CompactionJob
 
 app = Starlette(routes=router.routes)
 
 publisher = OutboxPublisher()
+compaction_job = CompactionJob()
+app.state.compaction_job = compaction_job
+jwks = JWKSVerifier()
+app.state.jwks = jwks
 
 
 @app.on_event("startup")
@@ -15,8 +22,13 @@ async def on_startup():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     await publisher.start()
+    await jwks.start()
+    if settings.retention_enabled:
+        await compaction_job.start()
 
 
 @app.on_event("shutdown")
 async def on_shutdown():
+    await jwks.stop()
+    await compaction_job.stop()
     await publisher.stop()
@@ -1,25 +1,63 @@
+import uuid
 from datetime import datetime
 
-from sqlalchemy import select
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models import OutboxEvent
 
 
-async def create_outbox_event(session: AsyncSession, topic: str, payload: dict) -> OutboxEvent:
-    event = OutboxEvent(topic=topic, payload=payload, status="pending")
+async def create_outbox_event(
+    session: AsyncSession, topic: str, payload: dict, key: str | None = None
+) -> OutboxEvent:
+    payload = {"event_id": uuid.uuid4().hex, **payload}
+    event = OutboxEvent(topic=topic, partition_key=key, payload=payload, status="pending")
     session.add(event)
     await session.flush()
     return event
 
 
 async def fetch_pending_outbox(session: AsyncSession, limit: int = 50):
-    stmt = select(OutboxEvent).where(OutboxEvent.status == "pending").limit(limit)
-    result = await session.execute(stmt)
-    return list(result.scalars())
-
-
-async def mark_outbox_published(session: AsyncSession, event: OutboxEvent):
-    event.status = "published"
-    event.published_at = datetime.utcnow()
-    await session.flush()
+    """Claim pending events for this worker until the session's transaction ends.
+
+    Rows locked by other replicas are skipped. For each partition key only the
+    worker holding the oldest pending event publishes, so events for one
+    payment never overtake each other across replicas.
+    """
+    stmt = (
+        select(OutboxEvent)
+        .where(OutboxEvent.status == "pending")
+        .order_by(OutboxEvent.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    claimed = list((await session.execute(stmt)).scalars())
+    keys = {event.partition_key for event in claimed if event.partition_key}
+    if not keys:
+        return claimed
+
+    oldest_pending = dict(
+        (
+            await session.execute(
+                select(OutboxEvent.partition_key, func.min(OutboxEvent.id))
+                .where(OutboxEvent.status == "pending", OutboxEvent.partition_key.in_(keys))
+                .group_by(OutboxEvent.partition_key)
+            )
+        ).all()
+    )
+    claimed_ids = {event.id for event in claimed}
+    return [
+        event
+        for event in claimed
+        if not event.partition_key or oldest_pending.get(event.partition_key) in claimed_ids
+    ]
+
+
+async def mark_outbox_published(session: AsyncSession, event_ids: list[int]):
+    if not event_ids:
+        return
+    await session.execute(
+        update(OutboxEvent)
+        .where(OutboxEvent.id.in_(event_ids))
+        .values(status="published", published_at=datetime.utcnow())
+    )
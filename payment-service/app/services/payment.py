@@ -60,6 +60,7 @@ async def create_payment(session: AsyncSession, payload, idempotency_key: str |
     await create_outbox_event(
         session,
         topic="payment.events",
+        key=str(payment.id),
         payload={
             "event_type": "payment_created",
             "payment_id": payment.id,
@@ -113,9 +114,11 @@ async def refund_payment(session: AsyncSession, payment: Payment, refund_request
     await create_outbox_event(
         session,
         topic="payment.events",
+        key=str(payment.id),
         payload={
             "event_type": "payment_refunded",
             "payment_id": payment.id,
+            "order_id": payment.order_id,
             "refund_id": refund.id,
             "amount": refund.amount,
             "currency": payment.currency,
@@ -136,6 +139,12 @@ async def record_webhook(session: AsyncSession, provider: str, event_id: str, pa
     return webhook
 
 
+async def mark_webhook_processed(session: AsyncSession, webhook: WebhookEvent):
+    webhook.status = "processed"
+    webhook.processed_at = datetime.utcnow()
+    await session.flush()
+
+
 async def apply_webhook(session: AsyncSession, payload: dict):
     payment_id = payload.get("payment_id")
     status = payload.get("status")
@@ -148,9 +157,11 @@ async def apply_webhook(session: AsyncSession, payload: dict):
         await create_outbox_event(
             session,
             topic="payment.events",
+            key=str(payment.id),
             payload={
                 "event_type": "payment_status_updated",
                 "payment_id": payment.id,
+                "order_id": payment.order_id,
                 "status": payment.status.value,
             },
         )
@@ -162,9 +173,11 @@ async def reconcile_provider_status(session: AsyncSession, payment: Payment):
     await create_outbox_event(
         session,
         topic="payment.events",
+        key=str(payment.id),
         payload={
             "event_type": "payment_reconciled",
             "payment_id": payment.id,
+            "order_id": payment.order_id,
             "status": payment.status.value,
         },
     )
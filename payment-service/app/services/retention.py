@@ -0,0 +1,180 @@
+import asyncio
+import gzip
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+import msgspec
+from sqlalchemy import bindparam, delete, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models import OutboxEvent, WebhookEvent
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CompactionStats:
+    table: str
+    rows_deleted: int = 0
+    seconds: float = 0.0
+    archive_path: str | None = None
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_deleted / self.seconds if self.seconds else 0.0
+
+
+@dataclass
+class TableSize:
+    table: str
+    rows: int
+    bytes: int
+
+
+@dataclass
+class RetentionReport:
+    finished_at: datetime | None = None
+    compactions: list[CompactionStats] = field(default_factory=list)
+    sizes: list[TableSize] = field(default_factory=list)
+    rows_deleted_total: dict[str, int] = field(default_factory=dict)
+
+
+def _row_to_dict(row) -> dict:
+    return {column.key: getattr(row, column.key) for column in row.__table__.columns}
+
+
+def _append_ndjson(path: str, rows: list[dict]):
+    with gzip.open(path, "ab") as handle:
+        for row in rows:
+            handle.write(msgspec.json.encode(row) + b"\n")
+
+
+async def _compact(model, eligible, table: str, archive_dir: str | None) -> CompactionStats:
+    stats = CompactionStats(table=table)
+    if archive_dir:
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+        stats.archive_path = os.path.join(archive_dir, f"{table}-{stamp}.ndjson.gz")
+
+    started = time.perf_counter()
+    while True:
+        # One short transaction per chunk keeps row locks brief.
+        async with SessionLocal() as session:
+            query = select(model) if stats.archive_path else select(model.id)
+            query = query.where(eligible).order_by(model.id).limit(settings.retention_chunk_size)
+            rows = list((await session.execute(query)).scalars())
+            if not rows:
+                break
+            if stats.archive_path:
+                await asyncio.to_thread(_append_ndjson, stats.archive_path, [_row_to_dict(row) for row in rows])
+                ids = [row.id for row in rows]
+            else:
+                ids = rows
+            await session.execute(
+                delete(model).where(model.id.in_(ids)).execution_options(synchronize_session=False)
+            )
+            await session.commit()
+        stats.rows_deleted += len(ids)
+        if len(ids) < settings.retention_chunk_size:
+            break
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+async def compact_outbox(archive_dir: str | None = None) -> CompactionStats:
+    cutoff = datetime.utcnow() - timedelta(days=settings.outbox_retention_days)
+    eligible = (OutboxEvent.status == "published") & (OutboxEvent.published_at < cutoff)
+    return await _compact(OutboxEvent, eligible, OutboxEvent.__tablename__, archive_dir)
+
+
+async def compact_webhooks(archive_dir: str | None = None) -> CompactionStats:
+    cutoff = datetime.utcnow() - timedelta(days=settings.webhook_retention_days)
+    eligible = (WebhookEvent.status == "processed") & (WebhookEvent.processed_at < cutoff)
+    return await _compact(WebhookEvent, eligible, WebhookEvent.__tablename__, archive_dir)
+
+
+async def fetch_table_sizes(session: AsyncSession, tables: list[str]) -> list[TableSize]:
+    result = await session.execute(
+        text(
+            "SELECT table_name, table_rows, data_length + index_length "
+            "FROM information_schema.tables "
+            "WHERE table_schema = DATABASE() AND table_name IN :tables"
+        ).bindparams(bindparam("tables", value=list(tables), expanding=True))
+    )
+    return [TableSize(table=name, rows=int(rows or 0), bytes=int(size or 0)) for name, rows, size in result]
+
+
+class CompactionJob:
+    def __init__(self):
+        self._task: asyncio.Task | None = None
+        self._stopping = asyncio.Event()
+        self.report = RetentionReport()
+
+    async def start(self):
+        if settings.retention_archive_dir:
+            os.makedirs(settings.retention_archive_dir, exist_ok=True)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._stopping.set()
+        if self._task:
+            await self._task
+
+    async def run_once(self) -> RetentionReport:
+        archive_dir = settings.retention_archive_dir
+        compactions = [await compact_outbox(archive_dir), await compact_webhooks(archive_dir)]
+        async with SessionLocal() as session:
+            sizes = await fetch_table_sizes(session, [stats.table for stats in compactions])
+
+        totals = dict(self.report.rows_deleted_total)
+        for stats in compactions:
+            totals[stats.table] = totals.get(stats.table, 0) + stats.rows_deleted
+            logger.info(
+                "Compacted %s: %d rows in %.2fs (%.0f rows/s)",
+                stats.table,
+                stats.rows_deleted,
+                stats.seconds,
+                stats.rows_per_second,
+            )
+        self.report = RetentionReport(
+            finished_at=datetime.utcnow(),
+            compactions=compactions,
+            sizes=sizes,
+            rows_deleted_total=totals,
+        )
+        return self.report
+
+    async def _run(self):
+        while not self._stopping.is_set():
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Retention compaction failed")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=settings.retention_interval_seconds)
+            except asyncio.TimeoutError:
+                continue
+
+
+def render_metrics(report: RetentionReport) -> str:
+    lines = [
+        "# TYPE payment_retention_rows_deleted_total counter",
+        *(
+            f'payment_retention_rows_deleted_total{{table="{table}"}} {count}'
+            for table, count in report.rows_deleted_total.items()
+        ),
+        "# TYPE payment_retention_rows_per_second gauge",
+        *(
+            f'payment_retention_rows_per_second{{table="{stats.table}"}} {stats.rows_per_second:.2f}'
+            for stats in report.compactions
+        ),
+        "# TYPE payment_table_rows gauge",
+        *(f'payment_table_rows{{table="{size.table}"}} {size.rows}' for size in report.sizes),
+        "# TYPE payment_table_bytes gauge",
+        *(f'payment_table_bytes{{table="{size.table}"}} {size.bytes}' for size in report.sizes),
+    ]
+    return "\n".join(lines) + "\n"
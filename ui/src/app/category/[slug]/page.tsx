@@ -2,9 +2,10 @@ import Link from "next/link";
 import { notFound } from "next/navigation";
 
 import { SiteShell } from "@/components/layout/site-shell";
+import { fetchCategoryTree, flattenCategoryTree } from "@/lib/categories";
 import { fetchAllPages } from "@/lib/http";
 import { getServiceBaseUrl } from "@/lib/services";
-import type { CatalogCategory, CatalogProduct } from "@/lib/types";
+import type { CatalogProduct } from "@/lib/types";
 
 type CategoryPageProps = {
   params: { slug: string };
@@ -12,18 +13,15 @@ type CategoryPageProps = {
 
 async function loadCategoryAndProducts(slug: string) {
   const catalogBase = getServiceBaseUrl("catalog");
-  const categories = await fetchAllPages<CatalogCategory>(
-    `${catalogBase}/v1/categories/`,
-  );
+  const categories = flattenCategoryTree(await fetchCategoryTree());
   const category = categories.find((item) => item.slug === slug);
   if (!category) {
     return { category: null, products: [] };
   }
   const products = await fetchAllPages<CatalogProduct>(
-    `${catalogBase}/v1/products/`,
+    `${catalogBase}/v1/products/?category=${category.id}`,
   );
-  const filtered = products.filter((product) => product.category === category.id);
-  return { category, products: filtered };
+  return { category, products };
 }
 
 export default async function CategoryPage({ params }: CategoryPageProps) {
@@ -8,7 +8,7 @@ import { AuthShell } from "@/components/layout/auth-shell";
 import { Button } from "@/components/ui/button";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Input } from "@/components/ui/input";
-import { setAuthToken } from "@/lib/auth";
+import { setAuthToken, setRefreshToken } from "@/lib/auth";
 
 export default function LoginPage() {
   const router = useRouter();
@@ -49,13 +49,16 @@ export default function LoginPage() {
       }
 
       const payload = (await response.json().catch(() => null)) as
-        | { access_token?: string }
+        | { access_token?: string; refresh_token?: string }
         | null;
       if (!payload?.access_token) {
         setErrorMessage("Login failed. Token is missing.");
         return;
       }
       setAuthToken(payload.access_token);
+      if (payload.refresh_token) {
+        setRefreshToken(payload.refresh_token);
+      }
       form.reset();
       router.push("/");
     } catch (error) {
@@ -1,14 +1,11 @@
 import { AuthActions } from "@/components/auth/auth-actions";
-import { fetchAllPages } from "@/lib/http";
+import { fetchCategoryTree, flattenCategoryTree } from "@/lib/categories";
 import { getPublicServiceBaseUrl, getServiceBaseUrl } from "@/lib/services";
 import type { CatalogCategory } from "@/lib/types";
 
 async function loadCategories(): Promise<CatalogCategory[]> {
-  const catalogBase = getServiceBaseUrl("catalog");
-  console.log("Catalog Base URL:", catalogBase);
-  return fetchAllPages<CatalogCategory>(`${catalogBase}/v1/categories/`, {
-    cache: "no-store",
-  });
+  const tree = await fetchCategoryTree({ cache: "no-store" });
+  return flattenCategoryTree(tree);
 }
 
 function resolveCategoryImageUrl(
@@ -13,7 +13,7 @@ type ProductPageProps = {
 async function loadProduct(slug: string) {
   const catalogBase = getServiceBaseUrl("catalog");
   const products = await fetchAllPages<CatalogProduct>(
-    `${catalogBase}/v1/products/`,
+    `${catalogBase}/v1/products/?slug=${encodeURIComponent(slug)}`,
   );
   const match = products.find((product) => product.slug === slug);
   if (!match) {
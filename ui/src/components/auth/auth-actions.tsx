@@ -4,7 +4,7 @@ import Link from "next/link";
 import { useEffect, useState } from "react";
 
 import { LogoutButton } from "@/components/auth/logout-button";
-import { clearAuthToken, getAuthToken } from "@/lib/auth";
+import { clearAuthToken, getAuthToken, refreshAuthToken } from "@/lib/auth";
 
 type AuthState = "unknown" | "authenticated" | "guest";
 
@@ -31,11 +31,20 @@ export function AuthActions() {
           setAuthState("guest");
           return;
         }
-        const response = await fetch(`${baseUrl}/auth/me`, {
-          headers: {
-            Authorization: `Bearer ${token}`,
-          },
-        });
+        const fetchMe = (accessToken: string) =>
+          fetch(`${baseUrl}/auth/me`, {
+            headers: {
+              Authorization: `Bearer ${accessToken}`,
+            },
+          });
+        let response = await fetchMe(token);
+        if (response.status === 401) {
+          // Access tokens are short-lived; try once with a rotated pair.
+          const refreshed = await refreshAuthToken(baseUrl);
+          if (refreshed) {
+            response = await fetchMe(refreshed);
+          }
+        }
         if (response.ok) {
           const payload = (await response.json().catch(() => null)) as AuthUser | null;
           setUser(payload);
@@ -3,7 +3,7 @@
 import { useRouter } from "next/navigation";
 import { useState } from "react";
 
-import { clearAuthToken } from "@/lib/auth";
+import { clearAuthToken, getAuthHeaders, getRefreshToken } from "@/lib/auth";
 
 export function LogoutButton() {
   const router = useRouter();
@@ -15,10 +15,19 @@ export function LogoutButton() {
     }
     setIsLoggingOut(true);
     try {
-      clearAuthToken();
+      const baseUrl = process.env.NEXT_PUBLIC_AUTH_API_URL;
+      if (baseUrl) {
+        // Revokes the session server-side so its tokens stop working.
+        await fetch(`${baseUrl}/auth/logout`, {
+          method: "POST",
+          headers: { "Content-Type": "application/json", ...getAuthHeaders() },
+          body: JSON.stringify({ refresh_token: getRefreshToken() }),
+        });
+      }
     } catch (error) {
       console.error("Logout failed:", error);
     } finally {
+      clearAuthToken();
       setIsLoggingOut(false);
       router.push("/login");
     }
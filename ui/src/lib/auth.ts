@@ -1,4 +1,5 @@
 const TOKEN_KEY = "markethub_access_token";
+const REFRESH_TOKEN_KEY = "markethub_refresh_token";
 
 export function getAuthToken(): string | null {
   if (typeof window === "undefined") {
@@ -14,11 +15,53 @@ export function setAuthToken(token: string) {
   window.localStorage.setItem(TOKEN_KEY, token);
 }
 
+export function getRefreshToken(): string | null {
+  if (typeof window === "undefined") {
+    return null;
+  }
+  return window.localStorage.getItem(REFRESH_TOKEN_KEY);
+}
+
+export function setRefreshToken(token: string) {
+  if (typeof window === "undefined") {
+    return;
+  }
+  window.localStorage.setItem(REFRESH_TOKEN_KEY, token);
+}
+
 export function clearAuthToken() {
   if (typeof window === "undefined") {
     return;
   }
   window.localStorage.removeItem(TOKEN_KEY);
+  window.localStorage.removeItem(REFRESH_TOKEN_KEY);
+}
+
+// Trades the stored refresh token for a new pair; the old refresh token is spent either way.
+export async function refreshAuthToken(baseUrl: string): Promise<string | null> {
+  const refreshToken = getRefreshToken();
+  if (!refreshToken) {
+    return null;
+  }
+  const response = await fetch(`${baseUrl}/auth/refresh`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ refresh_token: refreshToken }),
+  });
+  if (!response.ok) {
+    clearAuthToken();
+    return null;
+  }
+  const payload = (await response.json().catch(() => null)) as
+    | { access_token?: string; refresh_token?: string }
+    | null;
+  if (!payload?.access_token || !payload.refresh_token) {
+    clearAuthToken();
+    return null;
+  }
+  setAuthToken(payload.access_token);
+  setRefreshToken(payload.refresh_token);
+  return payload.access_token;
 }
 
 export function getAuthHeaders(): HeadersInit {
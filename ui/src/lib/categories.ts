@@ -0,0 +1,19 @@
+import { fetchJson } from "@/lib/http";
+import { getServiceBaseUrl } from "@/lib/services";
+import type { CatalogCategoryNode } from "@/lib/types";
+
+export async function fetchCategoryTree(
+  init?: RequestInit,
+): Promise<CatalogCategoryNode[]> {
+  const catalogBase = getServiceBaseUrl("catalog");
+  return fetchJson<CatalogCategoryNode[]>(
+    `${catalogBase}/v1/categories/tree/`,
+    init,
+  );
+}
+
+export function flattenCategoryTree(
+  nodes: CatalogCategoryNode[],
+): CatalogCategoryNode[] {
+  return nodes.flatMap((node) => [node, ...flattenCategoryTree(node.children)]);
+}
@@ -4,10 +4,16 @@ export type CatalogCategory = {
   slug: string;
   image: string | null;
   parent: number | null;
+  path: string;
+  depth: number;
   created_at: string;
   updated_at: string;
 };
 
+export type CatalogCategoryNode = CatalogCategory & {
+  children: CatalogCategoryNode[];
+};
+
 export type CatalogImage = {
   id: number;
   url: string;